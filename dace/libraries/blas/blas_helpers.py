@@ -23,24 +23,25 @@ def to_blastype(dtype):
         raise TypeError('Type %s not supported in BLAS operations' % dtype.__name__)
 
 
+# BLAS letter, CUDA C type, and name in the DaCe runtime per data type
+_CUBLAS_TYPE_METADATA = {
+    dtypes.float16: ('H', '__half', 'Half'),
+    dtypes.float32: ('S', 'float', 'Float'),
+    dtypes.float64: ('D', 'double', 'Double'),
+    dtypes.complex64: ('C', 'cuComplex', 'Complex64'),
+    dtypes.complex128: ('Z', 'cuDoubleComplex', 'Complex128'),
+}
+
+
 def cublas_type_metadata(dtype: dtypes.typeclass) -> Tuple[str, str, str]:
     """ 
     Returns type metadata on a given dace dtype. 
     
     :return: A 3 tuple of (BLAS letter, CUDA C type, Name in dace runtime).
     """
-
-    if dtype == dtypes.float16:
-        return 'H', '__half', 'Half'
-    elif dtype == dtypes.float32:
-        return 'S', 'float', 'Float'
-    elif dtype == dtypes.float64:
-        return 'D', 'double', 'Double'
-    elif dtype == dtypes.complex64:
-        return 'C', 'cuComplex', 'Complex64'
-    elif dtype == dtypes.complex128:
-        return 'Z', 'cuDoubleComplex', 'Complex128'
-    else:
+    try:
+        return _CUBLAS_TYPE_METADATA[dtype]
+    except KeyError:
         raise TypeError('Type %s not supported in BLAS operations' % str(dtype))
 
 
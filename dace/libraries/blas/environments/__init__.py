@@ -2,5 +2,6 @@
 from .blas import *
 from .openblas import *
 from .intel_mkl import *
+from .libxsmm import *
 from .cublas import *
 from .rocblas import *
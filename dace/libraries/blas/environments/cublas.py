@@ -10,7 +10,7 @@ class cuBLAS:
     cmake_packages = []
     cmake_variables = {}
     cmake_includes = []
-    cmake_libraries = ["cublas"]
+    cmake_libraries = ["cublas", "cublasLt"]
     cmake_compile_flags = []
     cmake_link_flags = []
     cmake_files = []
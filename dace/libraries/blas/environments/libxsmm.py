@@ -0,0 +1,53 @@
+# Copyright 2019-2023 ETH Zurich and the DaCe authors. All rights reserved.
+import ctypes.util
+import os
+
+from dace import config, library
+from dace.libraries.blas.environments.openblas import OpenBLAS
+
+
+@library.environment
+class LIBXSMM:
+    """
+    An environment for LIBXSMM, a library of JIT-compiled kernels for small dense matrix multiplications.
+    The installation can be specified with the ``LIBXSMM_ROOT`` environment variable. Products that LIBXSMM has no
+    specialized kernel for are forwarded to the BLAS library, which is provided by OpenBLAS.
+    """
+
+    cmake_minimum_version = None
+    cmake_packages = []
+    cmake_variables = {}
+    cmake_compile_flags = []
+    cmake_link_flags = []
+    cmake_files = []
+
+    headers = ["libxsmm.h"]
+    state_fields = []
+    init_code = "libxsmm_init();"
+    finalize_code = "libxsmm_finalize();"
+    dependencies = [OpenBLAS]
+
+    @staticmethod
+    def cmake_includes():
+        if 'LIBXSMM_ROOT' in os.environ:
+            return [os.path.join(os.environ['LIBXSMM_ROOT'], 'include')]
+        else:
+            return []
+
+    @staticmethod
+    def cmake_libraries():
+        names = ['xsmm']
+        if 'LIBXSMM_ROOT' in os.environ:
+            prefix = config.Config.get('compiler', 'library_prefix')
+            suffix = config.Config.get('compiler', 'library_extension')
+            libfiles = [os.path.join(os.environ['LIBXSMM_ROOT'], 'lib', prefix + name + '.' + suffix) for name in names]
+            if all(os.path.isfile(libfile) for libfile in libfiles):
+                return libfiles
+
+        return names
+
+    @staticmethod
+    def is_installed():
+        if 'LIBXSMM_ROOT' in os.environ:
+            return os.path.isfile(os.path.join(os.environ['LIBXSMM_ROOT'], 'include', 'libxsmm.h'))
+        return ctypes.util.find_library('xsmm') is not None
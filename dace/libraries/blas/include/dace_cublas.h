@@ -3,10 +3,15 @@
 
 #include <cuda_runtime.h>
 #include <cublas_v2.h>
+#include <cublasLt.h>
 
-#include <cstddef>    // size_t
-#include <stdexcept>  // std::runtime_error
-#include <string>     // std::to_string
+#include <algorithm>   // std::min
+#include <cstddef>     // size_t
+#include <cstdint>     // int64_t, uint32_t, uintptr_t
+#include <functional>  // std::hash
+#include <stdexcept>   // std::runtime_error
+#include <string>      // std::to_string
+#include <tuple>       // std::tie
 #include <unordered_map>
 
 namespace dace {
@@ -137,6 +142,191 @@ class _CublasConstants {
   void* custom_beta_;
 };
 
+/**
+ * Problem description of a cuBLASLt matrix multiplication, used to cache
+ * matrix layouts and the algorithm chosen by the heuristic. The alignment of
+ * the matrix pointers (in bytes, up to 256) is set when the multiplication is
+ * called, as algorithms may require aligned pointers.
+ **/
+struct CublasLtMatmulKey {
+  cudaDataType_t type;
+  cublasComputeType_t compute_type;
+  cudaDataType_t scale_type;
+  cublasOperation_t ta, tb;
+  int64_t m, n, k, lda, ldb, ldc;
+  uint32_t alignment = 0;
+
+  bool operator==(CublasLtMatmulKey const& other) const {
+    return std::tie(type, compute_type, scale_type, ta, tb, m, n, k, lda, ldb,
+                    ldc, alignment) ==
+           std::tie(other.type, other.compute_type, other.scale_type, other.ta,
+                    other.tb, other.m, other.n, other.k, other.lda, other.ldb,
+                    other.ldc, other.alignment);
+  }
+};
+
+struct CublasLtMatmulKeyHash {
+  size_t operator()(CublasLtMatmulKey const& key) const {
+    size_t result = 0;
+    auto combine = [&result](int64_t value) {
+      result ^= std::hash<int64_t>()(value) + 0x9e3779b9 + (result << 6) +
+                (result >> 2);
+    };
+    for (int64_t value :
+         {(int64_t)key.type, (int64_t)key.compute_type,
+          (int64_t)key.scale_type, (int64_t)key.ta, (int64_t)key.tb, key.m,
+          key.n, key.k, key.lda, key.ldb, key.ldc, (int64_t)key.alignment}) {
+      combine(value);
+    }
+    return result;
+  }
+};
+
+struct CublasLtMatmulPlan {
+  cublasLtMatmulDesc_t desc;
+  cublasLtMatrixLayout_t a, b, c;
+  cublasLtMatmulAlgo_t algo;
+};
+
+/**
+ * Per-device cuBLASLt state: library handle, per-stream workspaces, and the
+ * cache of matrix multiplication plans.
+ **/
+class _CublasLtContext {
+ public:
+  // Workspace size recommended for Hopper GPUs (also sufficient for older
+  // architectures)
+  static constexpr size_t kWorkspaceSize = 32 * 1024 * 1024;
+
+  _CublasLtContext(int device) {
+    if (device >= 0) {
+      if (cudaSetDevice(device) != cudaSuccess) {
+        throw std::runtime_error("Failed to set CUDA device.");
+      }
+    }
+    CheckCublasError(cublasLtCreate(&handle_));
+  }
+
+  _CublasLtContext(_CublasLtContext const&) = delete;
+
+  ~_CublasLtContext() {
+    for (auto& p : plans_) {
+      cublasLtMatrixLayoutDestroy(p.second.a);
+      cublasLtMatrixLayoutDestroy(p.second.b);
+      cublasLtMatrixLayoutDestroy(p.second.c);
+      cublasLtMatmulDescDestroy(p.second.desc);
+    }
+    for (auto& w : workspaces_) {
+      cudaFree(w.second);
+    }
+    cublasLtDestroy(handle_);
+  }
+
+  _CublasLtContext& operator=(_CublasLtContext const&) = delete;
+
+  /**
+   * Computes C = alpha * op(A) @ op(B) + beta * C (column-major). Matrix
+   * layouts and the algorithm are created once per problem description and
+   * pointer alignment. Scaling factors are given on the host, in the scale
+   * type.
+   **/
+  void Matmul(cudaStream_t stream, CublasLtMatmulKey const& key,
+              void const* alpha, void const* A, void const* B,
+              void const* beta, void* C) {
+    CublasLtMatmulKey aligned_key = key;
+    aligned_key.alignment = std::min(
+        {Alignment(A), Alignment(B), Alignment(static_cast<void const*>(C))});
+    CublasLtMatmulPlan const& plan = GetPlan(aligned_key);
+    CheckCublasError(cublasLtMatmul(handle_, plan.desc, alpha, A, plan.a, B,
+                                    plan.b, beta, C, plan.c, C, plan.c,
+                                    &plan.algo, GetWorkspace(stream),
+                                    kWorkspaceSize, stream));
+  }
+
+ private:
+  // Largest power of two (up to 256) that divides the address of a pointer
+  static uint32_t Alignment(void const* ptr) {
+    uintptr_t address = reinterpret_cast<uintptr_t>(ptr);
+    uint32_t alignment = 256;
+    while (alignment > 1 && address % alignment != 0) {
+      alignment /= 2;
+    }
+    return alignment;
+  }
+
+  /**
+   * Returns the workspace of the given stream. Kernels on different streams
+   * may run concurrently, so they cannot share scratch memory.
+   **/
+  void* GetWorkspace(cudaStream_t stream) {
+    auto f = workspaces_.find(stream);
+    if (f != workspaces_.end()) {
+      return f->second;
+    }
+
+    void* workspace;
+    if (cudaMalloc(&workspace, kWorkspaceSize) != cudaSuccess) {
+      throw std::runtime_error("Failed to allocate cuBLASLt workspace.");
+    }
+    return workspaces_.emplace(stream, workspace).first->second;
+  }
+
+  CublasLtMatmulPlan const& GetPlan(CublasLtMatmulKey const& key) {
+    auto f = plans_.find(key);
+    if (f != plans_.end()) {
+      return f->second;
+    }
+
+    CublasLtMatmulPlan plan;
+    CheckCublasError(
+        cublasLtMatmulDescCreate(&plan.desc, key.compute_type, key.scale_type));
+    CheckCublasError(cublasLtMatmulDescSetAttribute(
+        plan.desc, CUBLASLT_MATMUL_DESC_TRANSA, &key.ta, sizeof(key.ta)));
+    CheckCublasError(cublasLtMatmulDescSetAttribute(
+        plan.desc, CUBLASLT_MATMUL_DESC_TRANSB, &key.tb, sizeof(key.tb)));
+    bool const na = key.ta == CUBLAS_OP_N, nb = key.tb == CUBLAS_OP_N;
+    CheckCublasError(cublasLtMatrixLayoutCreate(
+        &plan.a, key.type, na ? key.m : key.k, na ? key.k : key.m, key.lda));
+    CheckCublasError(cublasLtMatrixLayoutCreate(
+        &plan.b, key.type, nb ? key.k : key.n, nb ? key.n : key.k, key.ldb));
+    CheckCublasError(
+        cublasLtMatrixLayoutCreate(&plan.c, key.type, key.m, key.n, key.ldc));
+
+    cublasLtMatmulPreference_t preference;
+    CheckCublasError(cublasLtMatmulPreferenceCreate(&preference));
+    size_t workspace_size = kWorkspaceSize;
+    CheckCublasError(cublasLtMatmulPreferenceSetAttribute(
+        preference, CUBLASLT_MATMUL_PREF_MAX_WORKSPACE_BYTES, &workspace_size,
+        sizeof(workspace_size)));
+    // Without these, the heuristic assumes 256-byte aligned pointers
+    for (auto attr : {CUBLASLT_MATMUL_PREF_MIN_ALIGNMENT_A_BYTES,
+                      CUBLASLT_MATMUL_PREF_MIN_ALIGNMENT_B_BYTES,
+                      CUBLASLT_MATMUL_PREF_MIN_ALIGNMENT_C_BYTES,
+                      CUBLASLT_MATMUL_PREF_MIN_ALIGNMENT_D_BYTES}) {
+      CheckCublasError(cublasLtMatmulPreferenceSetAttribute(
+          preference, attr, &key.alignment, sizeof(key.alignment)));
+    }
+    cublasLtMatmulHeuristicResult_t result;
+    int count = 0;
+    CheckCublasError(cublasLtMatmulAlgoGetHeuristic(
+        handle_, plan.desc, plan.a, plan.b, plan.c, plan.c, preference, 1,
+        &result, &count));
+    cublasLtMatmulPreferenceDestroy(preference);
+    if (count == 0) {
+      throw std::runtime_error("No cuBLASLt algorithm found for GEMM.");
+    }
+    plan.algo = result.algo;
+
+    return plans_.emplace(key, plan).first->second;
+  }
+
+  cublasLtHandle_t handle_;
+  std::unordered_map<cudaStream_t, void*> workspaces_;
+  std::unordered_map<CublasLtMatmulKey, CublasLtMatmulPlan,
+                     CublasLtMatmulKeyHash>
+      plans_;
+};
+
 /**
  * CUBLAS wrapper class for DaCe. Once constructed, the class can be used to
  * get or create a CUBLAS library handle (cublasHandle_t) for a given GPU ID,
@@ -170,6 +360,15 @@ class CublasHandle {
     return f->second;
   }
 
+  _CublasLtContext& Lt(int device) {
+    auto f = lt_contexts_.find(device);
+    if (f == lt_contexts_.end()) {
+      // Lazily construct new cuBLASLt handle and plan cache
+      f = lt_contexts_.emplace(device, device).first;
+    }
+    return f->second;
+  }
+
   ~CublasHandle() {
     for (auto& h : handles_) {
       CheckCublasError(cublasDestroy(h.second));
@@ -180,6 +379,7 @@ class CublasHandle {
 
   std::unordered_map<int, cublasHandle_t> handles_;
   std::unordered_map<int, _CublasConstants> constants_;
+  std::unordered_map<int, _CublasLtContext> lt_contexts_;
 };
 
 }  // namespace blas
@@ -8,11 +8,22 @@ from dace.frontend.common import op_repository as oprepo
 import dace.sdfg.nodes
 from dace.transformation.transformation import ExpandTransformation
 from dace.libraries.blas.blas_helpers import (to_blastype, get_gemm_opts, check_access, dtype_to_cudadatatype,
-                                              to_cublas_computetype)
-from dace.libraries.blas.nodes.matmul import (_get_matmul_operands, _get_batchmm_opts, _get_codegen_gemm_opts)
+                                              to_cublas_computetype, cublas_type_metadata)
+from dace.libraries.blas.nodes.matmul import (_get_matmul_operands, _get_batchmm_opts, _get_codegen_gemm_opts,
+                                              _all_static)
 from .. import environments
 import warnings
 
+# The scaling factors 1 and 0 per data type, as passed to CPU BLAS libraries
+_BLAS_CONSTANTS = {
+    dace.float32: ("1.0f", "0.0f"),
+    dace.float64: ("1.0", "0.0"),
+    dace.complex64:
+    ("dace::blas::BlasConstants::Get().Complex64Pone()", "dace::blas::BlasConstants::Get().Complex64Zero()"),
+    dace.complex128:
+    ("dace::blas::BlasConstants::Get().Complex128Pone()", "dace::blas::BlasConstants::Get().Complex128Zero()"),
+}
+
 
 @dace.library.expansion
 class ExpandBatchedMatMulPure(ExpandTransformation):
@@ -35,7 +46,7 @@ class ExpandBatchedMatMulPure(ExpandTransformation):
         elif not res:
             raise SyntaxError("Matrix sizes must match")
         if bopt:
-            shape_c = (bopt['b'], shape_a[-2], shape_b[-1])
+            shape_c = (*bopt['shape'], shape_a[-2], shape_b[-1])
         else:
             shape_c = (shape_a[-2], shape_b[-1])
 
@@ -64,15 +75,22 @@ class ExpandBatchedMatMulPure(ExpandTransformation):
 
         state = sdfg.add_state_after(init_state, node.label + "_state")
 
+        # One map parameter per batch dimension
+        batch_params = ['__i0'] if len(bopt['shape']) == 1 else ['__i0_%d' % i for i in range(len(bopt['shape']))]
+        batch_idx = ', '.join(batch_params)
+        idx_a = '__i1, __i3' if len(array_a.shape) == 2 else batch_idx + ', __i1, __i3'
+        idx_b = '__i3, __i2' if len(array_b.shape) == 2 else batch_idx + ', __i3, __i2'
         state.add_mapped_tasklet(
             '_BatchedBatchedMatMult_', {
-                '__i%d' % i: '0:%s' % s
-                for i, s in enumerate([bopt['b'], array_a.shape[-2], array_b.shape[-1], array_a.shape[-1]])
+                p: '0:%s' % s
+                for p, s in zip(batch_params + ['__i1', '__i2', '__i3'],
+                                [*bopt['shape'], array_a.shape[-2], array_b.shape[-1], array_a.shape[-1]])
             }, {
-                '__a': dace.Memlet.simple("_a", ('__i1, __i3' if len(array_a.shape) == 2 else '__i0, __i1, __i3')),
-                '__b': dace.Memlet.simple("_b", ('__i3, __i2' if len(array_b.shape) == 2 else '__i0, __i3, __i2'))
+                '__a': dace.Memlet.simple("_a", idx_a),
+                '__b': dace.Memlet.simple("_b", idx_b)
             },
-            '__c = __a * __b', {'__c': dace.Memlet.simple("_c", '__i0, __i1, __i2', wcr_str='lambda x, y: x + y')},
+            '__c = __a * __b',
+            {'__c': dace.Memlet.simple("_c", batch_idx + ', __i1, __i2', wcr_str='lambda x, y: x + y')},
             external_edges=True)
 
         return sdfg
@@ -91,32 +109,29 @@ class ExpandBatchedMatMulMKL(ExpandTransformation):
     @staticmethod
     def expansion(node, state, sdfg):
         node.validate(sdfg, state)
-        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = _get_matmul_operands(node, state, sdfg)
+        operands = _get_matmul_operands(node, state, sdfg)
+        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = operands
         cdesc: dt.Array = sdfg.arrays[state.out_edges(node)[0].data.data]
         check_access(dtypes.ScheduleType.CPU_Multicore, adesc, bdesc, cdesc)
         dtype = cdesc.dtype.base_type
         func = to_blastype(dtype.type).lower() + 'gemm'
-        if dtype == dace.float32:
-            alpha = "1.0f"
-            beta = "0.0f"
-            prefix = "s"
-        elif dtype == dace.float64:
-            alpha = "1.0"
-            beta = "0.0"
-            prefix = "d"
-        elif dtype == dace.complex64:
-            alpha = "dace::blas::BlasConstants::Get().Complex64Pone()"
-            beta = "dace::blas::BlasConstants::Get().Complex64Zero()"
-            prefix = "c"
-        elif dtype == dace.complex128:
-            alpha = "dace::blas::BlasConstants::Get().Complex128Pone()"
-            beta = "dace::blas::BlasConstants::Get().Complex128Zero()"
-            prefix = "z"
-        else:
+        try:
+            alpha, beta = _BLAS_CONSTANTS[dtype]
+        except KeyError:
             raise ValueError("Unsupported type for BLAS dot product: " + str(dtype))
-        opt = _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta, cdesc.dtype.ctype, func)
-
-        opt['prefix'] = prefix
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     alpha,
+                                     beta,
+                                     cdesc.dtype.ctype,
+                                     func,
+                                     operands=operands)
+
+        opt['prefix'] = func[0]
         opt['dtype'] = cdesc.dtype.ctype
 
         code = '''
@@ -137,9 +152,9 @@ class ExpandBatchedMatMulMKL(ExpandTransformation):
         const {dtype}** B = new const {dtype}*[{BATCH}];
         {dtype}** C = new {dtype}*[{BATCH}];
         for (int __ib = 0; __ib < {BATCH}; __ib++) {{
-            A[__ib] = (({dtype}*){x}) + __ib*{stride_a};
-            B[__ib] = (({dtype}*){y}) + __ib*{stride_b};
-            C[__ib] = (({dtype}*)_c) + __ib*{stride_c};
+            A[__ib] = (({dtype}*){x}) + {offset_a};
+            B[__ib] = (({dtype}*){y}) + {offset_b};
+            C[__ib] = (({dtype}*)_c) + {offset_c};
         }}
 
         {prefix}gemm_batch(transa, transb, m_array, n_array, k_array, alpha_array, A, lda_array, B, ldb_array, beta_array, C, ldc_array, &group_count, group_sizes);'''.format_map(
@@ -160,26 +175,28 @@ class ExpandBatchedMatMulOpenBLAS(ExpandTransformation):
     @staticmethod
     def expansion(node, state, sdfg):
         node.validate(sdfg, state)
-        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = _get_matmul_operands(node, state, sdfg)
+        operands = _get_matmul_operands(node, state, sdfg)
+        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = operands
         cdesc = sdfg.arrays[state.out_edges(node)[0].data.data]
         check_access(dtypes.ScheduleType.CPU_Multicore, adesc, bdesc, cdesc)
         dtype = cdesc.dtype.base_type
         func = to_blastype(dtype.type).lower() + 'gemm'
-        if dtype == dace.float32:
-            alpha = "1.0f"
-            beta = "0.0f"
-        elif dtype == dace.float64:
-            alpha = "1.0"
-            beta = "0.0"
-        elif dtype == dace.complex64:
-            alpha = "dace::blas::BlasConstants::Get().Complex64Pone()"
-            beta = "dace::blas::BlasConstants::Get().Complex64Zero()"
-        elif dtype == dace.complex128:
-            alpha = "dace::blas::BlasConstants::Get().Complex128Pone()"
-            beta = "dace::blas::BlasConstants::Get().Complex128Zero()"
-        else:
+        try:
+            alpha, beta = _BLAS_CONSTANTS[dtype]
+        except KeyError:
             raise ValueError("Unsupported type for BLAS dot product: " + str(dtype))
-        opt = _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta, cdesc.dtype.ctype, func)
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     alpha,
+                                     beta,
+                                     cdesc.dtype.ctype,
+                                     func,
+                                     row_major=True,
+                                     operands=operands)
 
         # Adaptations for MKL/BLAS API
         opt['ta'] = 'CblasNoTrans' if opt['ta'] == 'N' else 'CblasTrans'
@@ -187,11 +204,11 @@ class ExpandBatchedMatMulOpenBLAS(ExpandTransformation):
 
         code = '''
         for (int __ib = 0; __ib < {BATCH}; ++__ib) {{
-            cblas_{func}(CblasColMajor, {ta}, {tb}, {M}, {N}, {K}, {alpha},
-                         (({dtype}*){x}) + __ib*{stride_a}, {lda},
-                         (({dtype}*){y}) + __ib*{stride_b}, {ldb},
+            cblas_{func}({layout}, {ta}, {tb}, {M}, {N}, {K}, {alpha},
+                         (({dtype}*){x}) + {offset_a}, {lda},
+                         (({dtype}*){y}) + {offset_b}, {ldb},
                          {beta},
-                         (({dtype}*)_c) + __ib*{stride_c}, {ldc});
+                         (({dtype}*)_c) + {offset_c}, {ldc});
         }}'''.format_map(opt)
 
         tasklet = dace.sdfg.nodes.Tasklet(node.name,
@@ -202,6 +219,88 @@ class ExpandBatchedMatMulOpenBLAS(ExpandTransformation):
         return tasklet
 
 
+@dace.library.expansion
+class ExpandBatchedMatMulLIBXSMM(ExpandTransformation):
+    """
+    Expands the batched matrix multiplication to a LIBXSMM kernel, which is invoked for every matrix in the batch.
+    If all sizes are known at compile time, the kernel is dispatched once on initialization and kept in the program
+    state; otherwise, it is looked up on every call. If no specialized kernel is available (e.g., for unsupported
+    transposition flags), falls back to the LIBXSMM GEMM interface.
+    """
+    environments = [environments.libxsmm.LIBXSMM]
+
+    @staticmethod
+    def expansion(node, state, sdfg):
+        node.validate(sdfg, state)
+        operands = _get_matmul_operands(node, state, sdfg)
+        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = operands
+        cdesc = sdfg.arrays[state.out_edges(node)[0].data.data]
+        check_access(dtypes.ScheduleType.CPU_Multicore, adesc, bdesc, cdesc)
+        dtype = cdesc.dtype.base_type
+        if dtype not in (dace.float32, dace.float64):
+            raise ValueError("Unsupported type for LIBXSMM matrix multiplication: " + str(dtype))
+        func = to_blastype(dtype.type).lower() + 'gemm'
+        alpha, beta = _BLAS_CONSTANTS[dtype]
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     alpha,
+                                     beta,
+                                     cdesc.dtype.ctype,
+                                     func,
+                                     operands=operands)
+        opt['prefix'] = func[0]
+
+        args = '''
+        const libxsmm_blasint __m = {M}, __n = {N}, __k = {K};
+        const libxsmm_blasint __lda = {lda}, __ldb = {ldb}, __ldc = {ldc};
+        const {dtype} __alpha = {alpha}, __beta = {beta};
+        const int __flags = LIBXSMM_GEMM_FLAGS('{ta}', '{tb}');
+        '''.format_map(opt)
+        dispatch = ('libxsmm_{prefix}mmdispatch(__m, __n, __k, &__lda, &__ldb, &__ldc, &__alpha, &__beta, '
+                    '&__flags, NULL)').format_map(opt)
+
+        state_fields = []
+        code_init = ''
+        if _all_static(opt):
+            existing = {
+                field.split()[-1].rstrip(';')
+                for n, _ in sdfg.root_sdfg.all_nodes_recursive() if isinstance(n, dace.sdfg.nodes.Tasklet)
+                for field in n.state_fields
+            }
+            kernel = dt.find_new_name(f'libxsmm_kernel_{sdfg.cfg_id}_{state.block_id}_{state.node_id(node)}', existing)
+            state_fields.append(f'libxsmm_{opt["prefix"]}mmfunction {kernel};')
+            code_init = f'{{{args}__state->{kernel} = {dispatch};\n}}'
+            code = args + f'const libxsmm_{opt["prefix"]}mmfunction __kernel = __state->{kernel};'
+        else:
+            code = args + f'const libxsmm_{opt["prefix"]}mmfunction __kernel = {dispatch};'
+
+        code += '''
+        for (int __ib = 0; __ib < {BATCH}; ++__ib) {{
+            const {dtype} *__a = (({dtype}*){x}) + {offset_a};
+            const {dtype} *__b = (({dtype}*){y}) + {offset_b};
+            {dtype} *__c = (({dtype}*)_c) + {offset_c};
+            if (__kernel) {{
+                __kernel(__a, __b, __c);
+            }} else {{
+                libxsmm_{func}("{ta}", "{tb}", &__m, &__n, &__k, &__alpha, __a, &__lda, __b, &__ldb, &__beta,
+                               __c, &__ldc);
+            }}
+        }}'''.format_map(opt)
+
+        tasklet = dace.sdfg.nodes.Tasklet(node.name,
+                                          node.in_connectors,
+                                          node.out_connectors,
+                                          code,
+                                          language=dace.dtypes.Language.CPP,
+                                          state_fields=state_fields,
+                                          code_init=code_init)
+        return tasklet
+
+
 @dace.library.expansion
 class ExpandBatchedMatMulCuBLAS(ExpandTransformation):
 
@@ -210,51 +309,40 @@ class ExpandBatchedMatMulCuBLAS(ExpandTransformation):
     @staticmethod
     def expansion(node, state, sdfg):
         node.validate(sdfg, state)
-
-        # Find inputs and output
-        adesc, bdesc, cdesc = None, None, None
-        for e in state.in_edges(node):
-            if e.dst_conn == '_a':
-                anode = state.memlet_path(e)[0].src
-                if isinstance(anode, dace.sdfg.nodes.AccessNode):
-                    adesc: dt.Array = sdfg.arrays[anode.data]
-            elif e.dst_conn == '_b':
-                bnode = state.memlet_path(e)[0].src
-                if isinstance(bnode, dace.sdfg.nodes.AccessNode):
-                    bdesc: dt.Array = sdfg.arrays[bnode.data]
-        for e in state.out_edges(node):
-            if e.src_conn == '_c':
-                cnode = state.memlet_path(e)[-1].dst
-                if isinstance(cnode, dace.sdfg.nodes.AccessNode):
-                    cdesc: dt.Array = sdfg.arrays[cnode.data]
-        if not adesc or not bdesc or not cdesc:
-            raise ValueError('Unsupported input/output arrays')
+        operands = _get_matmul_operands(node, state, sdfg)
+        (_, adesc, _, _), (_, bdesc, _, _), (_, cdesc, _, _) = operands
 
         needs_copy = any(desc.storage not in (dace.StorageType.GPU_Global, dace.StorageType.CPU_Pinned)
                          for desc in (adesc, bdesc, cdesc))
 
         dtype = cdesc.dtype.base_type
-        func = '%sgemm' % to_blastype(dtype.type)
-        if dtype == dace.float16:
-            cdtype = '__half'
-            factort = 'Half'
-        elif dtype == dace.float32:
-            cdtype = 'float'
-            factort = 'Float'
-        elif dtype == dace.float64:
-            cdtype = 'double'
-            factort = 'Double'
-        elif dtype == dace.complex64:
-            cdtype = 'cuComplex'
-            factort = 'Complex64'
-        elif dtype == dace.complex128:
-            cdtype = 'cuDoubleComplex'
-            factort = 'Complex128'
-        else:
+        try:
+            blastype, cdtype, factort = cublas_type_metadata(dtype)
+        except TypeError:
             raise ValueError("Unsupported type: " + str(dtype))
+        func = '%sgemm' % blastype
 
         call_prefix = environments.cublas.cuBLAS.handle_setup_code(node)
         call_suffix = ''
+
+        # Half-precision products are computed on tensor cores with single-precision accumulation (unless
+        # requested otherwise), in which case the scaling factors are single-precision as well
+        use_ex = (dtype == dace.float16 or node.compute_type is not None or node.accumulator_type is not None
+                  or node.algorithm is not None)
+        scale_dtype, scale_cdtype = dtype, cdtype
+        if use_ex:
+            if node.compute_type is not None:
+                acctype = node.compute_type
+            elif node.accumulator_type is not None:
+                acc_dtype: dtypes.typeclass = node.accumulator_type
+                acctype = f'CUBLAS_COMPUTE_{to_cublas_computetype(acc_dtype)}'
+            elif dtype == dace.float16:
+                acctype = 'CUBLAS_COMPUTE_32F'
+            else:
+                acctype = f'CUBLAS_COMPUTE_{to_cublas_computetype(dtype)}'
+            if dtype == dace.float16 and acctype != 'CUBLAS_COMPUTE_16F':
+                scale_dtype, scale_cdtype, factort = dace.float32, 'float', 'Float'
+
         # Handle alpha / beta
         constants = {
             1.0: f"__state->cublas_handle.Constants(__dace_cuda_device).{factort}Pone()",
@@ -263,30 +351,89 @@ class ExpandBatchedMatMulCuBLAS(ExpandTransformation):
         if node.alpha not in constants:
             # Deal with complex input constants
             if isinstance(node.alpha, complex):
-                alpha = f'{dtype.ctype}({node.alpha.real}, {node.alpha.imag})'
+                alpha = f'{scale_dtype.ctype}({node.alpha.real}, {node.alpha.imag})'
             else:
-                alpha = f'{dtype.ctype}({node.alpha})'
+                alpha = f'{scale_dtype.ctype}({node.alpha})'
 
             # Set pointer mode to host
             call_prefix += f'''cublasSetPointerMode(__dace_cublas_handle, CUBLAS_POINTER_MODE_HOST);
-                {dtype.ctype} alpha = {alpha};
-                {dtype.ctype} beta = 0;
+                {scale_dtype.ctype} alpha = {alpha};
+                {scale_dtype.ctype} beta = 0;
                 '''
             call_suffix += '''
     cublasSetPointerMode(__dace_cublas_handle, CUBLAS_POINTER_MODE_DEVICE);
                 '''
-            beta = f'({cdtype} *)&beta'
-            alpha = f'({cdtype} *)&alpha'
+            beta = f'({scale_cdtype} *)&beta'
+            alpha = f'({scale_cdtype} *)&alpha'
         else:
             alpha = constants[node.alpha]
             beta = "__state->cublas_handle.Constants(__dace_cuda_device).%sZero()" % factort
 
         # Set up options for code formatting
-        opt = _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta, cdtype, func)
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     alpha,
+                                     beta,
+                                     cdtype,
+                                     func,
+                                     operands=operands)
         opt['array_prefix'] = '_' if needs_copy else ''
 
+        # Matrices that are not evenly spaced are passed as arrays of pointers. The host and device pointer arrays
+        # are kept in the program state and only reallocated if the batch grows. Since the operands may reside at
+        # different addresses on every call, the pointers are filled on the host and copied to the device in
+        # stream order on each call
+        use_pointers = opt['stride_a'] is None
+        state_fields = []
+        code_init = ''
+        code_exit = ''
+        if use_pointers:
+            existing = {
+                field.split()[-1].rstrip(';')
+                for n, _ in sdfg.root_sdfg.all_nodes_recursive() if isinstance(n, dace.sdfg.nodes.Tasklet)
+                for field in n.state_fields
+            }
+            ptrs = dt.find_new_name(f'cublas_batch_ptrs_{sdfg.cfg_id}_{state.block_id}_{state.node_id(node)}', existing)
+            state_fields = [f'const void **{ptrs};', f'const void **{ptrs}_dev;', f'size_t {ptrs}_size;']
+            code_init = f'__state->{ptrs} = nullptr;\n__state->{ptrs}_dev = nullptr;\n__state->{ptrs}_size = 0;'
+            code_exit = f'delete[] __state->{ptrs};\ncudaFree(__state->{ptrs}_dev);'
+
+            prefix = opt['array_prefix']
+            call_prefix += f'''
+            const size_t __nptrs = 3 * ({opt['BATCH']});
+            if (__state->{ptrs}_size < __nptrs) {{
+                delete[] __state->{ptrs};
+                cudaFree(__state->{ptrs}_dev);
+                __state->{ptrs} = new const void *[__nptrs];
+                cudaMalloc((void **)&__state->{ptrs}_dev, __nptrs * sizeof(void *));
+                __state->{ptrs}_size = __nptrs;
+            }}
+            const void **__ptrs = __state->{ptrs};
+            const void **__dptrs = __state->{ptrs}_dev;
+            for (int __ib = 0; __ib < {opt['BATCH']}; ++__ib) {{
+                __ptrs[__ib] = (({cdtype}*){prefix}{opt['x']}) + {opt['offset_a']};
+                __ptrs[({opt['BATCH']}) + __ib] = (({cdtype}*){prefix}{opt['y']}) + {opt['offset_b']};
+                __ptrs[2 * ({opt['BATCH']}) + __ib] = (({cdtype}*){prefix}_c) + {opt['offset_c']};
+            }}
+            cudaMemcpyAsync(__dptrs, __ptrs, __nptrs * sizeof(void *), cudaMemcpyHostToDevice, __dace_current_stream);
+            '''
+
         # Matrix multiplication
-        if (node.compute_type is None and node.accumulator_type is None and node.algorithm is None):
+        if use_pointers and not use_ex:
+            call = '''cublas{func}Batched(__dace_cublas_handle,
+                CUBLAS_OP_{ta}, CUBLAS_OP_{tb},
+                {M}, {N}, {K},
+                {alpha},
+                (const {dtype}**)__dptrs, {lda},
+                (const {dtype}**)(__dptrs + ({BATCH})), {ldb},
+                {beta},
+                ({dtype}**)(__dptrs + 2 * ({BATCH})), {ldc},
+                {BATCH});'''.format_map(opt)
+        elif not use_ex:
             call = '''cublas{func}StridedBatched(__dace_cublas_handle,
                 CUBLAS_OP_{ta}, CUBLAS_OP_{tb},
                 {M}, {N}, {K},
@@ -297,43 +444,58 @@ class ExpandBatchedMatMulCuBLAS(ExpandTransformation):
                 ({dtype}*){array_prefix}_c, {ldc}, {stride_c},
                 {BATCH});'''.format_map(opt)
         else:
-            if node.compute_type is not None:
-                acctype = node.compute_type
-            elif node.accumulator_type is not None:
-                acc_dtype: dtypes.typeclass = node.accumulator_type
-                acctype = f'CUBLAS_COMPUTE_{to_cublas_computetype(acc_dtype)}'
-            else:
-                acctype = f'CUBLAS_COMPUTE_{to_cublas_computetype(dtype)}'
-
             algorithm = 'CUBLAS_GEMM_DEFAULT_TENSOR_OP'
             if node.algorithm is not None:
                 algorithm = node.algorithm
 
-            call = f'''
-            cublasGemmStridedBatchedEx(__dace_cublas_handle,
-                CUBLAS_OP_{opt['ta']}, CUBLAS_OP_{opt['tb']},
-                {opt['M']}, {opt['N']}, {opt['K']},
-                {alpha},
-                {opt['array_prefix']}{opt['x']},
-                {dtype_to_cudadatatype(opt['xdtype'])},
-                {opt['lda']}, {opt['stride_a']},
-                {opt['array_prefix']}{opt['y']},
-                {dtype_to_cudadatatype(opt['ydtype'])},
-                {opt['ldb']}, {opt['stride_b']},
-                {beta},
-                {opt['array_prefix']}_c,
-                {dtype_to_cudadatatype(opt['cdtype'])},
-                {opt['ldc']}, {opt['stride_c']},
-                {opt['BATCH']},
-                {acctype}, {algorithm});
-            '''
+            if use_pointers:
+                call = f'''
+                cublasGemmBatchedEx(__dace_cublas_handle,
+                    CUBLAS_OP_{opt['ta']}, CUBLAS_OP_{opt['tb']},
+                    {opt['M']}, {opt['N']}, {opt['K']},
+                    {alpha},
+                    __dptrs,
+                    {dtype_to_cudadatatype(opt['xdtype'])},
+                    {opt['lda']},
+                    __dptrs + ({opt['BATCH']}),
+                    {dtype_to_cudadatatype(opt['ydtype'])},
+                    {opt['ldb']},
+                    {beta},
+                    (void **)(__dptrs + 2 * ({opt['BATCH']})),
+                    {dtype_to_cudadatatype(opt['cdtype'])},
+                    {opt['ldc']},
+                    {opt['BATCH']},
+                    {acctype}, {algorithm});
+                '''
+            else:
+                call = f'''
+                cublasGemmStridedBatchedEx(__dace_cublas_handle,
+                    CUBLAS_OP_{opt['ta']}, CUBLAS_OP_{opt['tb']},
+                    {opt['M']}, {opt['N']}, {opt['K']},
+                    {alpha},
+                    {opt['array_prefix']}{opt['x']},
+                    {dtype_to_cudadatatype(opt['xdtype'])},
+                    {opt['lda']}, {opt['stride_a']},
+                    {opt['array_prefix']}{opt['y']},
+                    {dtype_to_cudadatatype(opt['ydtype'])},
+                    {opt['ldb']}, {opt['stride_b']},
+                    {beta},
+                    {opt['array_prefix']}_c,
+                    {dtype_to_cudadatatype(opt['cdtype'])},
+                    {opt['ldc']}, {opt['stride_c']},
+                    {opt['BATCH']},
+                    {acctype}, {algorithm});
+                '''
 
         code = call_prefix + call + call_suffix
         tasklet = dace.sdfg.nodes.Tasklet(node.name,
                                           node.in_connectors,
                                           node.out_connectors,
                                           code,
-                                          language=dace.dtypes.Language.CPP)
+                                          language=dace.dtypes.Language.CPP,
+                                          state_fields=state_fields,
+                                          code_init=code_init,
+                                          code_exit=code_exit)
 
         # If buffers are not on the GPU, copy them
         if needs_copy:
@@ -343,7 +505,10 @@ class ExpandBatchedMatMulCuBLAS(ExpandTransformation):
                 '__b': dtypes.pointer(bdesc.dtype)
             }, {'__c': dtypes.pointer(cdesc.dtype)},
                                               code,
-                                              language=dace.dtypes.Language.CPP)
+                                              language=dace.dtypes.Language.CPP,
+                                              state_fields=state_fields,
+                                              code_init=code_init,
+                                              code_exit=code_exit)
 
             for name, desc in [('_a', adesc), ('_b', bdesc), ('_c', cdesc)]:
                 if isinstance(desc, dt.View):
@@ -386,6 +551,7 @@ class BatchedMatMul(dace.sdfg.nodes.LibraryNode):
         "pure": ExpandBatchedMatMulPure,
         "MKL": ExpandBatchedMatMulMKL,
         "OpenBLAS": ExpandBatchedMatMulOpenBLAS,
+        "LIBXSMM": ExpandBatchedMatMulLIBXSMM,
         "cuBLAS": ExpandBatchedMatMulCuBLAS
     }
     transA = properties.Property(dtype=bool, desc="Whether to transpose A before multiplying")
@@ -436,9 +602,9 @@ class BatchedMatMul(dace.sdfg.nodes.LibraryNode):
                              "batched matrix-matrix product")
         out_memlet = out_edges[0].data
         # Function is symmetric, edge order does not matter
-        if len(size0) not in [2, 3]:
+        if len(size1) < 3:
             raise ValueError("Batched matrix-matrix product only supported on matrices")
-        if len(size1) != 3:
+        if len(size0) not in [2, len(size1)]:
             raise ValueError("Batched matrix-matrix product only supported on matrices")
         res = equal(size0[-1], size1[-2])
         if res is None:
@@ -449,7 +615,7 @@ class BatchedMatMul(dace.sdfg.nodes.LibraryNode):
         out_subset = dc(out_memlet.subset)
         out_subset.squeeze()
         size2 = out_subset.size()
-        if len(size2) != 3:
+        if len(size2) != len(size1):
             raise ValueError("batched matrix-matrix product only supported on matrices")
 
 
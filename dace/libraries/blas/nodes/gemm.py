@@ -1,5 +1,6 @@
 # Copyright 2019-2023 ETH Zurich and the DaCe authors. All rights reserved.
 from copy import deepcopy as dc
+import functools
 from dace import dtypes, memlet as mm, properties, data as dt
 from dace.symbolic import symstr, equal
 import dace.library
@@ -8,34 +9,179 @@ from dace.frontend.common import op_repository as oprepo
 import dace.sdfg.nodes
 from dace.transformation.transformation import ExpandTransformation
 from dace.libraries.blas.blas_helpers import (to_blastype, get_gemm_opts, check_access, dtype_to_cudadatatype,
-                                              to_cublas_computetype)
-from dace.libraries.blas.nodes.matmul import (_get_matmul_operands, _get_codegen_gemm_opts)
+                                              to_cublas_computetype, cublas_type_metadata)
+from dace.libraries.blas.nodes.matmul import (_get_matmul_operands, _get_codegen_gemm_opts, _all_static)
 from .. import environments
 import numpy as np
 import warnings
+from typing import Any, Dict, List, Optional, Tuple
+
+_COMPLEX_NP = (np.complex64, np.complex128)
 
 
 def _is_complex(dtype):
     if hasattr(dtype, "is_complex") and callable(dtype.is_complex):
         return dtype.is_complex()
     else:
-        return dtype in [np.complex64, np.complex128]
+        return dtype in _COMPLEX_NP
 
 
+@functools.lru_cache(maxsize=256, typed=True)
 def _cast_to_dtype_str(value, dtype: dace.dtypes.typeclass) -> str:
     if _is_complex(dtype) and _is_complex(type(value)):
         raise ValueError("Cannot use complex beta with non-complex array")
 
+    typename = dace.dtype_to_typeclass(dtype).to_string()
     if _is_complex(dtype):
         cast_value = complex(value)
 
         return "dace.{type}({real}, {imag})".format(
-            type=dace.dtype_to_typeclass(dtype).to_string(),
+            type=typename,
             real=cast_value.real,
             imag=cast_value.imag,
         )
     else:
-        return "dace.{}({})".format(dace.dtype_to_typeclass(dtype).to_string(), value)
+        return "dace.{}({})".format(typename, value)
+
+
+def _get_epilogue_expr(node, dtype, acc: str, c: str = None) -> str:
+    """ Returns the expression that scales an accumulated product by alpha and adds C scaled by beta. """
+    if node.alpha == 1.0:
+        expr = acc
+    else:
+        expr = "{} * {}".format(_cast_to_dtype_str(node.alpha, dtype), acc)
+    if c is not None and node.beta == 1.0:
+        expr += " + {}".format(c)
+    elif c is not None:
+        expr += " + {} * {}".format(_cast_to_dtype_str(node.beta, dtype), c)
+    return expr
+
+
+def _get_matrix_dims(subset) -> List[int]:
+    """
+    Returns the dimensions of a GEMM operand subset that remain after squeezing (see ``Range.squeeze``). Matrices
+    with a unit dimension (e.g., [1, K] or [M, 1]) keep their last two dimensions rather than becoming vectors.
+    """
+    dims = dc(subset).squeeze()
+    if len(dims) < 2 and len(subset) >= 2:
+        dims = dc(subset).squeeze(ignore_indices=[len(subset) - 2, len(subset) - 1])
+    return dims
+
+
+def _get_gemm_operands(node, state, sdfg):
+    """ Returns the GEMM input and output edges, arrays, shapes, and strides, keeping unit matrix dimensions. """
+    operands = []
+    for edge, outer_array, _, _ in _get_matmul_operands(node, state, sdfg):
+        dims = _get_matrix_dims(edge.data.subset)
+        size = edge.data.subset.size()
+        operands.append((edge, outer_array, [size[i] for i in dims], [outer_array.strides[i] for i in dims]))
+    return tuple(operands)
+
+
+def _get_gemv_opts(node, operands) -> Optional[Dict[str, Any]]:
+    """
+    Returns the options to compute the given GEMM as a matrix-vector product if M or N is 1 at compile time, or
+    None otherwise. The matrix ``mat`` is described in column-major order (``rows``, ``cols``, ``lda``, ``trans``)
+    and multiplied by the vector ``vec`` with stride ``incx``, accumulating into C with stride ``incy``.
+    """
+    from dace.codegen.common import sym2cpp  # Avoid import loop
+
+    (_, _, ashape, astrides), (_, _, bshape, bstrides), (_, _, cshape, cstrides) = operands
+    if len(ashape) != 2 or len(bshape) != 2 or len(cshape) != 2:
+        return None
+    M = ashape[1] if node.transA else ashape[0]
+    N = bshape[0] if node.transB else bshape[1]
+
+    if N == 1:
+        # C = A @ b
+        mat, shape, strides, trans = '_a', ashape, astrides, node.transA
+        vec, incx, incy = '_b', bstrides[1 if node.transB else 0], cstrides[0]
+    elif M == 1:
+        # C^T = B^T @ a^T
+        mat, shape, strides, trans = '_b', bshape, bstrides, not node.transB
+        vec, incx, incy = '_a', astrides[0 if node.transA else 1], cstrides[1]
+    else:
+        return None
+
+    rows, cols = shape
+    if strides[0] == 1:
+        lda = strides[1]
+    elif strides[1] == 1:
+        # Row-major matrices are transposed column-major matrices
+        rows, cols, lda, trans = cols, rows, strides[0], not trans
+    else:
+        return None
+    if cols == 1:
+        lda = rows
+
+    return dict(mat=mat,
+                vec=vec,
+                trans='T' if trans else 'N',
+                rows=sym2cpp(rows),
+                cols=sym2cpp(cols),
+                lda=sym2cpp(lda),
+                incx=sym2cpp(incx),
+                incy=sym2cpp(incy))
+
+
+def _get_connectors(node, dtype: dtypes.typeclass, by_pointer: bool) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Returns the input and output connectors of a BLAS tasklet that computes the given GEMM. If ``by_pointer`` is set,
+    the matrices are passed by pointer even if they consist of a single element (e.g., C in a dot product).
+    """
+    if not by_pointer:
+        return node.in_connectors, node.out_connectors
+    in_connectors = {k: dtypes.pointer(dtype) if k in ('_a', '_b') else v for k, v in node.in_connectors.items()}
+    return in_connectors, {'_c': dtypes.pointer(dtype)}
+
+
+def _get_cin_shape(node, state, sdfg) -> Tuple[List[Any], List[Any]]:
+    """
+    Returns the shape and strides of the C input of the given GEMM. Unlike the other operands, broadcast
+    dimensions of size 1 are kept (e.g., [1, N] or [M, 1]), as they determine how C is broadcast to [M, N].
+    """
+    edge = next(e for e in state.in_edges(node) if e.dst_conn == '_cin')
+    outer_array = sdfg.data(dace.sdfg.find_input_arraynode(state, edge).data)
+    size = edge.data.subset.size()
+    dims = [i for i, s in enumerate(size) if s != 1 or i >= len(size) - 2]
+    return [size[i] for i in dims], [outer_array.strides[i] for i in dims]
+
+
+def _get_broadcast_index(shape_c, M, N, i: str, j: str) -> str:
+    """ Returns the index expression that reads element (i, j) of C broadcast to [M, N]. """
+    shape_c = list(shape_c)
+    if shape_c == [M, N]:
+        return f'{i}, {j}'
+    elif shape_c == [1, N]:
+        return f'0, {j}'
+    elif shape_c == [M, 1]:
+        return f'{i}, 0'
+    elif shape_c == [N]:
+        return j
+    elif shape_c == [1, 1]:
+        return '0, 0'
+    elif shape_c == [1]:
+        return '0'
+    raise ValueError("Could not broadcast input _c to ({}, {})".format(M, N))
+
+
+def _add_cin(node, parent_state, parent_sdfg, sdfg, M, N, dtype, storage, i: str,
+             j: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Adds the C input of the given GEMM to its nested SDFG. Returns the array that C is read from and the index
+    of element (i, j) in it, or (None, None) if C is not read. C is read from _cin if given, otherwise the product
+    is accumulated onto _c in-place. The index into C is specialized to the shape it is broadcast from.
+    """
+    if '_cin' in node.in_connectors:
+        shape_cin, strides_cin = _get_cin_shape(node, parent_state, parent_sdfg)
+        sdfg.add_array("_cin", shape_cin, dtype, strides=strides_cin, storage=storage)
+        if node.beta == 0:
+            # The input remains connected, but is never read
+            return None, None
+        return "_cin", _get_broadcast_index(shape_cin, M, N, i, j)
+    elif node.beta != 0:
+        return "_c", f'{i}, {j}'
+    return None, None
 
 
 @dace.library.expansion
@@ -48,7 +194,7 @@ class ExpandGemmPure(ExpandTransformation):
         sdfg = dace.SDFG(node.label + "_sdfg")
 
         ((edge_a, outer_array_a, shape_a, strides_a), (edge_b, outer_array_b, shape_b, strides_b),
-         cdata) = _get_matmul_operands(node, parent_state, parent_sdfg)
+         cdata) = _get_gemm_operands(node, parent_state, parent_sdfg)
 
         dtype_a = outer_array_a.dtype.type
         dtype_b = outer_array_b.dtype.type
@@ -68,87 +214,361 @@ class ExpandGemmPure(ExpandTransformation):
             raise SyntaxError("Matrix sizes must match")
         res = equal(trans_shape_a[1], trans_shape_b[0])
         if res is None:
-            warnings.warn(f"First matrix columns {trans_shape_a[1]} may not match "
-                          f"second matrix rows {trans_shape_b[0]}", UserWarning)
+            warnings.warn(
+                f"First matrix columns {trans_shape_a[1]} may not match "
+                f"second matrix rows {trans_shape_b[0]}", UserWarning)
         elif not res:
             raise SyntaxError("Matrix sizes must match")
         M, K, N = trans_shape_a[0], trans_shape_a[1], trans_shape_b[1]
         shape_c = (M, N)
 
-        storage = outer_array_a.storage
-
         _, array_a = sdfg.add_array("_a", shape_a, dtype_a, strides=strides_a, storage=outer_array_a.storage)
         _, array_b = sdfg.add_array("_b", shape_b, dtype_b, strides=strides_b, storage=outer_array_b.storage)
         _, array_c = sdfg.add_array("_c", shape_c, dtype_c, strides=cdata[-1], storage=cdata[1].storage)
 
-        if node.alpha == 1.0:
-            mul_program = "__out = __a * __b"
-        else:
-            mul_program = "__out = {} * __a * __b".format(_cast_to_dtype_str(node.alpha, dtype_a))
+        cin_name, memlet_idx = _add_cin(node, parent_state, parent_sdfg, sdfg, M, N, dtype_c, cdata[1].storage, '__i0',
+                                        '__i1')
+
+        # The reduction over K is accumulated in a register, so that alpha * (A @ B) + beta * C
+        # is written to _c exactly once
+        sdfg.add_scalar("_acc", dtype_c, storage=dtypes.StorageType.Register, transient=True)
+
+        epilogue = "__y = " + _get_epilogue_expr(node, dtype_a, "__acc", "__c" if cin_name else None)
+
+        state = sdfg.add_state(node.label + "_state")
+        read_a = state.add_read("_a")
+        read_b = state.add_read("_b")
+        write_c = state.add_write("_c")
+        init_acc = state.add_access("_acc")
+        acc = state.add_access("_acc")
+
+        # The innermost output index runs along the unit-stride dimensions of C and of the input it indexes (A for
+        # rows, B for columns). On ties, columns are innermost
+        rows_unit = (strides_a[1 if node.transA else 0] == 1) + (array_c.strides[0] == 1)
+        cols_unit = (strides_b[0 if node.transB else 1] == 1) + (array_c.strides[1] == 1)
+        map_ranges = {"__i0": "0:%s" % symstr(M), "__i1": "0:%s" % symstr(N)}
+        if rows_unit > cols_unit:
+            map_ranges = {"__i1": map_ranges["__i1"], "__i0": map_ranges["__i0"]}
+
+        map_entry, map_exit = state.add_map("gemm", map_ranges)
+        k_entry, k_exit = state.add_map("gemm_k", {"__i2": "0:%s" % symstr(K)}, schedule=dtypes.ScheduleType.Sequential)
+
+        init_tasklet = state.add_tasklet("gemm_init", {}, {"__out"}, "__out = 0")
+        mul_tasklet = state.add_tasklet("gemm", {"__a", "__b", "__acc_in"}, {"__out"}, "__out = __acc_in + __a * __b")
+        out_tasklet = state.add_tasklet("gemm_out", {"__acc", "__c"} if cin_name else {"__acc"}, {"__y"}, epilogue)
+
+        # Initialize accumulator
+        state.add_nedge(map_entry, init_tasklet, dace.Memlet())
+        state.add_edge(init_tasklet, "__out", init_acc, None, dace.Memlet("_acc[0]"))
+
+        # Multiplication map. The K map is sequential, so the accumulator is carried across iterations
+        # as a plain read-modify-write of a register rather than a write-conflict resolution
+        state.add_memlet_path(init_acc, k_entry, mul_tasklet, dst_conn="__acc_in", memlet=dace.Memlet("_acc[0]"))
+        state.add_memlet_path(read_a,
+                              map_entry,
+                              k_entry,
+                              mul_tasklet,
+                              dst_conn="__a",
+                              memlet=dace.Memlet.simple("_a", "__i2, __i0" if node.transA else "__i0, __i2"))
+        state.add_memlet_path(read_b,
+                              map_entry,
+                              k_entry,
+                              mul_tasklet,
+                              dst_conn="__b",
+                              memlet=dace.Memlet.simple("_b", "__i1, __i2" if node.transB else "__i2, __i1"))
+        state.add_memlet_path(mul_tasklet, k_exit, acc, src_conn="__out", memlet=dace.Memlet("_acc[0]"))
+
+        # Scale and add C, write output once
+        state.add_edge(acc, None, out_tasklet, "__acc", dace.Memlet("_acc[0]"))
+        if cin_name is not None:
+            state.add_memlet_path(state.add_read(cin_name),
+                                  map_entry,
+                                  out_tasklet,
+                                  dst_conn="__c",
+                                  memlet=dace.Memlet.simple(cin_name, memlet_idx))
+        state.add_memlet_path(out_tasklet,
+                              map_exit,
+                              write_c,
+                              src_conn="__y",
+                              memlet=dace.Memlet.simple("_c", "__i0, __i1"))
 
-        if node.beta == 1:
-            state = sdfg.add_state(node.label + "_state")
-        else:
-            init_state = sdfg.add_state(node.label + "_initstate")
-            state = sdfg.add_state_after(init_state, node.label + "_state")
+        return sdfg
 
-        if '_cin' in node.in_connectors:
-            sdfg.add_array("_cin", shape_c, dtype_c, strides=cdata[-1], storage=cdata[1].storage)
+    @staticmethod
+    def expansion(node, state, sdfg):
+        node.validate(sdfg, state)
+        return ExpandGemmPure.make_sdfg(node, state, sdfg)
 
-        mul_out, mul_out_array = "_c", array_c
-        output_nodes = None
 
-        # Initialization / beta map
-        if node.beta == 0:
-            init_state.add_mapped_tasklet(
-                'gemm_init', {'_o%d' % i: '0:%s' % symstr(d)
-                              for i, d in enumerate(shape_c)}, {},
-                'out = 0', {'out': dace.Memlet.simple(mul_out, ','.join(['_o%d' % i for i in range(len(shape_c))]))},
-                external_edges=True)
-        elif node.beta == 1:
-            # Do nothing for initialization, only update the values
-            pass
+@dace.library.expansion
+class ExpandGemmPureBlocked(ExpandTransformation):
+    """
+    Cache- and register-blocked GEMM expansion following the loop structure of
+    BLIS/GotoBLAS kernels.
+
+    For every ``nc``-wide panel of C and ``kc``-wide slice of the K
+    dimension, the corresponding panel of B is packed once into a contiguous
+    buffer. The ``mc x nc`` blocks of C in the panel are then computed in
+    parallel, each packing its slice of A into a thread-local buffer. Both
+    buffers are ordered such that the microkernel reads them with unit stride,
+    and are allocated once per call. Each block is traversed in register
+    tiles of ``mr x nr`` elements, which are accumulated in a register array
+    across the K slice and written back to C. The ``mr`` rows of the
+    microkernel are unrolled, leaving a vectorizable loop over the ``nr``
+    columns of each row (ideally a multiple of the SIMD width).
+    """
+
+    environments = []
+
+    @staticmethod
+    def make_sdfg(node, parent_state, parent_sdfg, mc, nc, kc, mr, nr):
+        if mc % mr != 0 or nc % nr != 0:
+            raise ValueError("GEMM cache block sizes must be multiples of the register tile sizes")
+
+        sdfg = dace.SDFG(node.label + "_sdfg")
+
+        ((edge_a, outer_array_a, shape_a, strides_a), (edge_b, outer_array_b, shape_b, strides_b),
+         cdata) = _get_gemm_operands(node, parent_state, parent_sdfg)
+
+        dtype_a = outer_array_a.dtype.type
+        dtype_b = outer_array_b.dtype.type
+        dtype_c = dace.dtype_to_typeclass(np.result_type(dtype_a, dtype_b).type)
+
+        if node.transA:
+            trans_shape_a = list(reversed(shape_a))
         else:
-            # Beta map
-            add_program = "__y = ({} * __c)".format(_cast_to_dtype_str(node.beta, dtype_a))
-
-            # manually broadcasting C to [M, N]
-            if list(shape_c) == [M, N]:
-                memlet_idx = '__i0, __i1'
-            elif list(shape_c) == [1, N]:
-                memlet_idx = '0, __i1'
-            elif list(shape_c) == [M, 1]:
-                memlet_idx = '__i0, 0'
-            elif list(shape_c) == [N]:
-                memlet_idx = '__i1'
-            else:
-                raise ValueError("Could not broadcast input _c to ({}, {})".format(M, N))
-
-            init_state.add_mapped_tasklet("gemm_init", {"__i%d" % i: "0:%s" % s
-                                                        for i, s in enumerate([M, N])}, {
-                                                            "__c": dace.Memlet.simple("_cin", memlet_idx),
-                                                        },
-                                          add_program, {"__y": dace.Memlet.simple("_c", "__i0, __i1")},
-                                          external_edges=True)
-
-        # Multiplication map
-        state.add_mapped_tasklet("gemm", {"__i%d" % i: "0:%s" % s
-                                          for i, s in enumerate([M, N, K])},
-                                 {
-                                     "__a": dace.Memlet.simple("_a", "__i2, __i0" if node.transA else "__i0, __i2"),
-                                     "__b": dace.Memlet.simple("_b", "__i1, __i2" if node.transB else "__i2, __i1")
-                                 },
-                                 mul_program,
-                                 {"__out": dace.Memlet.simple(mul_out, "__i0, __i1", wcr_str="lambda x, y: x + y")},
-                                 external_edges=True,
-                                 output_nodes=output_nodes)
+            trans_shape_a = shape_a
+
+        if node.transB:
+            trans_shape_b = list(reversed(shape_b))
+        else:
+            trans_shape_b = shape_b
+
+        if len(trans_shape_a) != 2 or len(trans_shape_b) != 2:
+            raise SyntaxError("Matrix sizes must match")
+        res = equal(trans_shape_a[1], trans_shape_b[0])
+        if res is None:
+            warnings.warn(
+                f"First matrix columns {trans_shape_a[1]} may not match "
+                f"second matrix rows {trans_shape_b[0]}", UserWarning)
+        elif not res:
+            raise SyntaxError("Matrix sizes must match")
+        M, K, N = trans_shape_a[0], trans_shape_a[1], trans_shape_b[1]
+        shape_c = (M, N)
+
+        sdfg.add_array("_a", shape_a, dtype_a, strides=strides_a, storage=outer_array_a.storage)
+        sdfg.add_array("_b", shape_b, dtype_b, strides=strides_b, storage=outer_array_b.storage)
+        sdfg.add_array("_c", shape_c, dtype_c, strides=cdata[-1], storage=cdata[1].storage)
+
+        cin_name, cin_idx = _add_cin(node, parent_state, parent_sdfg, sdfg, M, N, dtype_c, cdata[1].storage, '__i',
+                                     '__j')
+
+        # Packed panels of A (mr-row panels, one buffer per thread) and B (nr-column panels, shared by all blocks
+        # of a panel of C) for one K slice, and register tile
+        sdfg.add_array("_a_pack", [mc // mr, kc, mr],
+                       dtype_a,
+                       storage=dtypes.StorageType.CPU_ThreadLocal,
+                       lifetime=dtypes.AllocationLifetime.SDFG,
+                       transient=True)
+        sdfg.add_array("_b_pack", [nc // nr, kc, nr],
+                       dtype_b,
+                       storage=dtypes.StorageType.CPU_Heap,
+                       lifetime=dtypes.AllocationLifetime.SDFG,
+                       transient=True)
+        sdfg.add_array("_acc", [mr, nr], dtype_c, storage=dtypes.StorageType.Register, transient=True)
+
+        M, N, K = symstr(M), symstr(N), symstr(K)
+
+        state = sdfg.add_state(node.label + "_state")
+        read_a = state.add_read("_a")
+        read_b = state.add_read("_b")
+        read_c = state.add_read("_c")
+        write_c = state.add_write("_c")
+        a_pack = state.add_access("_a_pack")
+        b_pack = state.add_access("_b_pack")
+        init_acc = state.add_access("_acc")
+        acc = state.add_access("_acc")
+
+        # Panels of C (JC loop) and slices of the K dimension (PC loop)
+        panel_entry, panel_exit = state.add_map("gemm_panel", {"__jc": f"0:{N}:{nc}"},
+                                                schedule=dtypes.ScheduleType.Sequential)
+        kblock_entry, kblock_exit = state.add_map("gemm_kblock", {"__pc": f"0:{K}:{kc}"},
+                                                  schedule=dtypes.ScheduleType.Sequential)
+        # Parallel cache blocks of C within a panel (IC loop)
+        block_entry, block_exit = state.add_map("gemm_block", {"__ic": f"0:{M}:{mc}"},
+                                                schedule=dtypes.ScheduleType.CPU_Multicore)
+
+        # Pack A and B. Rows (columns) past the end of the matrix are padded with zeros, so that the
+        # microkernel always operates on full register tiles with unit-stride accesses
+        pack_a_entry, pack_a_exit = state.add_map("gemm_pack_a", {
+            "__p": f"0:int_ceil(Min({mc}, {M} - __ic), {mr})",
+            "__k": f"__pc:Min(__pc + {kc}, {K})",
+            "__r": f"0:{mr}"
+        },
+                                                  schedule=dtypes.ScheduleType.Sequential)
+        pack_a_tasklet = state.add_tasklet("gemm_pack_a", {"__in"}, {"__out"},
+                                           f"__out = __in if __ic + __p * {mr} + __r < {M} else 0")
+        row = f"Min(__ic + __p * {mr} + __r, {M} - 1)"
+        state.add_memlet_path(read_a,
+                              panel_entry,
+                              kblock_entry,
+                              block_entry,
+                              pack_a_entry,
+                              pack_a_tasklet,
+                              dst_conn="__in",
+                              memlet=dace.Memlet.simple("_a", f"__k, {row}" if node.transA else f"{row}, __k"))
+        state.add_memlet_path(pack_a_tasklet,
+                              pack_a_exit,
+                              a_pack,
+                              src_conn="__out",
+                              memlet=dace.Memlet("_a_pack[__p, __k - __pc, __r]"))
+
+        pack_b_entry, pack_b_exit = state.add_map("gemm_pack_b", {
+            "__p": f"0:int_ceil(Min({nc}, {N} - __jc), {nr})",
+            "__k": f"__pc:Min(__pc + {kc}, {K})",
+            "__r": f"0:{nr}"
+        },
+                                                  schedule=dtypes.ScheduleType.CPU_Multicore)
+        pack_b_tasklet = state.add_tasklet("gemm_pack_b", {"__in"}, {"__out"},
+                                           f"__out = __in if __jc + __p * {nr} + __r < {N} else 0")
+        col = f"Min(__jc + __p * {nr} + __r, {N} - 1)"
+        state.add_memlet_path(read_b,
+                              panel_entry,
+                              kblock_entry,
+                              pack_b_entry,
+                              pack_b_tasklet,
+                              dst_conn="__in",
+                              memlet=dace.Memlet.simple("_b", f"{col}, __k" if node.transB else f"__k, {col}"))
+        state.add_memlet_path(pack_b_tasklet,
+                              pack_b_exit,
+                              b_pack,
+                              src_conn="__out",
+                              memlet=dace.Memlet("_b_pack[__p, __k - __pc, __r]"))
+
+        # Register tiles within a cache block (JR/IR loops)
+        tile_entry, tile_exit = state.add_map("gemm_tile", {
+            "__ti": f"0:int_ceil(Min({mc}, {M} - __ic), {mr})",
+            "__tj": f"0:int_ceil(Min({nc}, {N} - __jc), {nr})"
+        },
+                                              schedule=dtypes.ScheduleType.Sequential)
+        init_entry, init_exit = state.add_map("gemm_init", {
+            "__r": f"0:{mr}",
+            "__c": f"0:{nr}"
+        },
+                                              schedule=dtypes.ScheduleType.Sequential)
+        k_entry, k_exit = state.add_map("gemm_k", {"__k": f"0:Min({kc}, {K} - __pc)"},
+                                        schedule=dtypes.ScheduleType.Sequential)
+        # The rows of the register tile are unrolled, such that each one is updated by a unit-stride loop over
+        # the tile columns that the compiler maps onto SIMD registers
+        row_entry, row_exit = state.add_map("gemm_micro_row", {"__r": f"0:{mr}"}, schedule=dtypes.ScheduleType.Unrolled)
+        micro_entry, micro_exit = state.add_map("gemm_micro", {"__c": f"0:{nr}"},
+                                                schedule=dtypes.ScheduleType.Sequential)
+        out_entry, out_exit = state.add_map("gemm_out", {
+            "__i": f"__ic + __ti * {mr}:Min(__ic + __ti * {mr} + {mr}, {M})",
+            "__j": f"__jc + __tj * {nr}:Min(__jc + __tj * {nr} + {nr}, {N})"
+        },
+                                            schedule=dtypes.ScheduleType.Sequential)
+
+        # Zero register tile
+        init_tasklet = state.add_tasklet("gemm_init", {}, {"__out"}, "__out = 0")
+        state.add_nedge(tile_entry, init_entry, dace.Memlet())
+        state.add_nedge(init_entry, init_tasklet, dace.Memlet())
+        state.add_memlet_path(init_tasklet, init_exit, init_acc, src_conn="__out", memlet=dace.Memlet("_acc[__r, __c]"))
+
+        # Microkernel: rank-1 updates of the register tile from the packed panels
+        mul_tasklet = state.add_tasklet("gemm", {"__a", "__b", "__acc_in"}, {"__out"}, "__out = __acc_in + __a * __b")
+        state.add_memlet_path(init_acc,
+                              k_entry,
+                              row_entry,
+                              micro_entry,
+                              mul_tasklet,
+                              dst_conn="__acc_in",
+                              memlet=dace.Memlet("_acc[__r, __c]"))
+        state.add_memlet_path(a_pack,
+                              tile_entry,
+                              k_entry,
+                              row_entry,
+                              micro_entry,
+                              mul_tasklet,
+                              dst_conn="__a",
+                              memlet=dace.Memlet("_a_pack[__ti, __k, __r]"))
+        state.add_memlet_path(b_pack,
+                              block_entry,
+                              tile_entry,
+                              k_entry,
+                              row_entry,
+                              micro_entry,
+                              mul_tasklet,
+                              dst_conn="__b",
+                              memlet=dace.Memlet("_b_pack[__tj, __k, __c]"))
+        state.add_memlet_path(mul_tasklet,
+                              micro_exit,
+                              row_exit,
+                              k_exit,
+                              acc,
+                              src_conn="__out",
+                              memlet=dace.Memlet("_acc[__r, __c]"))
+
+        # Write back register tile. The first K slice scales and adds C, the following ones accumulate onto
+        # the partial result in _c
+        product = _get_epilogue_expr(node, dtype_a, "__acc")
+        first = _get_epilogue_expr(node, dtype_a, "__acc", "__c" if cin_name else None)
+        out_tasklet = state.add_tasklet("gemm_out", {"__acc", "__c", "__cprev"} if cin_name else {"__acc", "__cprev"},
+                                        {"__y"}, f"""\
+if __pc == 0:
+    __y = {first}
+else:
+    __y = __cprev + {product}""")
+        state.add_memlet_path(acc,
+                              out_entry,
+                              out_tasklet,
+                              dst_conn="__acc",
+                              memlet=dace.Memlet(f"_acc[__i - __ic - __ti * {mr}, __j - __jc - __tj * {nr}]"))
+        if cin_name is not None:
+            state.add_memlet_path(state.add_read(cin_name),
+                                  panel_entry,
+                                  kblock_entry,
+                                  block_entry,
+                                  tile_entry,
+                                  out_entry,
+                                  out_tasklet,
+                                  dst_conn="__c",
+                                  memlet=dace.Memlet.simple(cin_name, cin_idx))
+        state.add_memlet_path(read_c,
+                              panel_entry,
+                              kblock_entry,
+                              block_entry,
+                              tile_entry,
+                              out_entry,
+                              out_tasklet,
+                              dst_conn="__cprev",
+                              memlet=dace.Memlet.simple("_c", "__i, __j"))
+        state.add_memlet_path(out_tasklet,
+                              out_exit,
+                              tile_exit,
+                              block_exit,
+                              kblock_exit,
+                              panel_exit,
+                              write_c,
+                              src_conn="__y",
+                              memlet=dace.Memlet.simple("_c", "__i, __j"))
 
         return sdfg
 
     @staticmethod
-    def expansion(node, state, sdfg):
+    def expansion(node, state, sdfg, mc=96, nc=256, kc=256, mr=6, nr=16):
+        """
+        :param node: Node to expand.
+        :param state: State that the node is in.
+        :param sdfg: SDFG that the node is in.
+        :param mc: Number of rows of C in a cache block.
+        :param nc: Number of columns of C in a cache block.
+        :param kc: Length of the K slice accumulated in registers before writing back.
+        :param mr: Number of rows of the register tile (must divide ``mc``).
+        :param nr: Number of columns of the register tile (must divide ``nc``).
+        """
         node.validate(sdfg, state)
-        return ExpandGemmPure.make_sdfg(node, state, sdfg)
+        return ExpandGemmPureBlocked.make_sdfg(node, state, sdfg, mc, nc, kc, mr, nr)
 
 
 @dace.library.expansion
@@ -159,7 +579,8 @@ class ExpandGemmOpenBLAS(ExpandTransformation):
     @staticmethod
     def expansion(node, state, sdfg):
         node.validate(sdfg, state)
-        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = _get_matmul_operands(node, state, sdfg)
+        operands = _get_gemm_operands(node, state, sdfg)
+        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = operands
         dtype = adesc.dtype.base_type
         func = to_blastype(dtype.type).lower() + 'gemm'
         alpha = f'{dtype.ctype}({node.alpha})'
@@ -175,24 +596,98 @@ class ExpandGemmOpenBLAS(ExpandTransformation):
 
         check_access(dtypes.ScheduleType.CPU_Multicore, adesc, bdesc, cdesc)
 
-        opt = _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta, dtype.ctype, func)
-
-        # Adaptations for BLAS API
-        opt['ta'] = 'CblasNoTrans' if opt['ta'] == 'N' else 'CblasTrans'
-        opt['tb'] = 'CblasNoTrans' if opt['tb'] == 'N' else 'CblasTrans'
-
         code = ''
         if dtype in (dace.complex64, dace.complex128):
             code = f'''
             {dtype.ctype} __alpha = {alpha};
             {dtype.ctype} __beta = {beta};
             '''
-            opt['alpha'] = '&__alpha'
-            opt['beta'] = '&__beta'
+            alpha = '&__alpha'
+            beta = '&__beta'
+
+        # Products with a single row or column of C are matrix-vector products
+        gemv = _get_gemv_opts(node, operands)
+        if gemv is not None:
+            gemv['func'] = to_blastype(dtype.type).lower() + 'gemv'
+            gemv['trans'] = 'CblasNoTrans' if gemv['trans'] == 'N' else 'CblasTrans'
+            code += ("cblas_{func}(CblasColMajor, {trans}, {rows}, {cols}, {alpha}, {mat}, {lda}, "
+                     "{vec}, {incx}, {beta}, _c, {incy});").format(alpha=alpha, beta=beta, **gemv)
+        else:
+            opt = _get_codegen_gemm_opts(node,
+                                         state,
+                                         sdfg,
+                                         adesc,
+                                         bdesc,
+                                         cdesc,
+                                         alpha,
+                                         beta,
+                                         dtype.ctype,
+                                         func,
+                                         row_major=True,
+                                         operands=operands)
+
+            # Adaptations for BLAS API
+            opt['ta'] = 'CblasNoTrans' if opt['ta'] == 'N' else 'CblasTrans'
+            opt['tb'] = 'CblasNoTrans' if opt['tb'] == 'N' else 'CblasTrans'
+
+            code += ("cblas_{func}({layout}, {ta}, {tb}, "
+                     "{M}, {N}, {K}, {alpha}, {x}, {lda}, {y}, {ldb}, {beta}, "
+                     "_c, {ldc});").format_map(opt)
+
+        tasklet = dace.sdfg.nodes.Tasklet(
+            node.name,
+            *_get_connectors(node, dtype, gemv is not None),
+            code,
+            language=dace.dtypes.Language.CPP,
+        )
+        return tasklet
 
-        code += ("cblas_{func}(CblasColMajor, {ta}, {tb}, "
-                 "{M}, {N}, {K}, {alpha}, {x}, {lda}, {y}, {ldb}, {beta}, "
-                 "_c, {ldc});").format_map(opt)
+
+@dace.library.expansion
+class ExpandGemmMKL(ExpandTransformation):
+    environments = [environments.intel_mkl.IntelMKL]
+
+    @staticmethod
+    def expansion(node, state, sdfg, **kwargs):
+        if node.packed_operand is None:
+            return ExpandGemmOpenBLAS.expansion(node, state, sdfg, **kwargs)
+
+        # One of the operands was packed ahead of time (see ``FuseSequentialGemmPack``), and alpha was
+        # already applied during packing
+        node.validate(sdfg, state)
+        operands = _get_gemm_operands(node, state, sdfg)
+        (_, adesc, _, _), (_, bdesc, _, _), _ = operands
+        dtype = adesc.dtype.base_type
+        if dtype not in (dace.float32, dace.float64):
+            raise ValueError('Packed GEMM is only supported for float32 and float64')
+        func = to_blastype(dtype.type).lower() + 'gemm'
+        beta = f'{dtype.ctype}({node.beta})'
+        cdesc = sdfg.arrays[state.out_edges(node)[0].data.data]
+
+        check_access(dtypes.ScheduleType.CPU_Multicore, adesc, bdesc, cdesc)
+
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     None,
+                                     beta,
+                                     dtype.ctype,
+                                     func,
+                                     row_major=True,
+                                     operands=operands)
+        opt['ta'] = 'CblasNoTrans' if opt['ta'] == 'N' else 'CblasTrans'
+        opt['tb'] = 'CblasNoTrans' if opt['tb'] == 'N' else 'CblasTrans'
+        if opt['x'] == node.packed_operand:
+            opt['x'], opt['ta'] = '_packed', 'CblasPacked'
+        else:
+            opt['y'], opt['tb'] = '_packed', 'CblasPacked'
+
+        code = ("cblas_{func}_compute({layout}, {ta}, {tb}, "
+                "{M}, {N}, {K}, {x}, {lda}, {y}, {ldb}, {beta}, "
+                "_c, {ldc});").format_map(opt)
 
         tasklet = dace.sdfg.nodes.Tasklet(
             node.name,
@@ -205,12 +700,78 @@ class ExpandGemmOpenBLAS(ExpandTransformation):
 
 
 @dace.library.expansion
-class ExpandGemmMKL(ExpandTransformation):
-    environments = [environments.intel_mkl.IntelMKL]
+class ExpandGemmLIBXSMM(ExpandTransformation):
+    """
+    Expands the matrix multiplication to a LIBXSMM kernel, which is JIT-compiled for the problem size, leading
+    dimensions, and scaling factors. If all sizes are known at compile time, the kernel is dispatched once on
+    initialization and kept in the program state; otherwise, it is looked up on every call. If no specialized
+    kernel is available (e.g., for unsupported scaling factors), falls back to the LIBXSMM GEMM interface.
+    """
+    environments = [environments.libxsmm.LIBXSMM]
 
     @staticmethod
-    def expansion(*args, **kwargs):
-        return ExpandGemmOpenBLAS.expansion(*args, **kwargs)
+    def expansion(node, state, sdfg):
+        node.validate(sdfg, state)
+        operands = _get_gemm_operands(node, state, sdfg)
+        (_, adesc, _, _), (_, bdesc, _, _), _ = operands
+        cdesc = sdfg.arrays[state.out_edges(node)[0].data.data]
+        check_access(dtypes.ScheduleType.CPU_Multicore, adesc, bdesc, cdesc)
+        dtype = adesc.dtype.base_type
+        if dtype not in (dace.float32, dace.float64):
+            raise ValueError("Unsupported type for LIBXSMM matrix multiplication: " + str(dtype))
+        func = to_blastype(dtype.type).lower() + 'gemm'
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     f'{dtype.ctype}({node.alpha})',
+                                     f'{dtype.ctype}({node.beta})',
+                                     dtype.ctype,
+                                     func,
+                                     operands=operands)
+        opt['prefix'] = func[0]
+
+        args = '''
+        const libxsmm_blasint __m = {M}, __n = {N}, __k = {K};
+        const libxsmm_blasint __lda = {lda}, __ldb = {ldb}, __ldc = {ldc};
+        const {dtype} __alpha = {alpha}, __beta = {beta};
+        const int __flags = LIBXSMM_GEMM_FLAGS('{ta}', '{tb}');
+        '''.format_map(opt)
+        dispatch = ('libxsmm_{prefix}mmdispatch(__m, __n, __k, &__lda, &__ldb, &__ldc, &__alpha, &__beta, '
+                    '&__flags, NULL)').format_map(opt)
+
+        state_fields = []
+        code_init = ''
+        if _all_static(opt):
+            existing = {
+                field.split()[-1].rstrip(';')
+                for n, _ in sdfg.root_sdfg.all_nodes_recursive() if isinstance(n, dace.sdfg.nodes.Tasklet)
+                for field in n.state_fields
+            }
+            kernel = dt.find_new_name(f'libxsmm_kernel_{sdfg.cfg_id}_{state.block_id}_{state.node_id(node)}', existing)
+            state_fields.append(f'libxsmm_{opt["prefix"]}mmfunction {kernel};')
+            code_init = f'{{{args}__state->{kernel} = {dispatch};\n}}'
+            code = args + f'const libxsmm_{opt["prefix"]}mmfunction __kernel = __state->{kernel};'
+        else:
+            code = args + f'const libxsmm_{opt["prefix"]}mmfunction __kernel = {dispatch};'
+
+        code += '''
+        if (__kernel) {{
+            __kernel({x}, {y}, _c);
+        }} else {{
+            libxsmm_{func}("{ta}", "{tb}", &__m, &__n, &__k, &__alpha, {x}, &__lda, {y}, &__ldb, &__beta,
+                           _c, &__ldc);
+        }}'''.format_map(opt)
+
+        tasklet = dace.sdfg.nodes.Tasklet(node.name,
+                                          *_get_connectors(node, dtype, True),
+                                          code,
+                                          language=dace.dtypes.Language.CPP,
+                                          state_fields=state_fields,
+                                          code_init=code_init)
+        return tasklet
 
 
 @dace.library.expansion
@@ -218,6 +779,13 @@ class ExpandGemmGPUBLAS(ExpandTransformation):
 
     environments = []
 
+    # Products whose output spans fewer tiles (of roughly ``split_k_tile`` squared elements) than ``split_k_blocks``
+    # split K into up to ``split_k_max`` chunks of at least ``split_k_min_chunk`` elements, see ``get_split_k``
+    split_k_tile = 128
+    split_k_blocks = 80
+    split_k_min_chunk = 256
+    split_k_max = 16
+
     @classmethod
     def expansion(cls, node, state, sdfg):
         node.validate(sdfg, state)
@@ -246,65 +814,120 @@ class ExpandGemmGPUBLAS(ExpandTransformation):
                          for desc in (adesc, bdesc, cdesc))
 
         dtype = adesc.dtype.base_type
-        func = cls.funcname(to_blastype(dtype.type))
-        if dtype == dace.float16:
-            cdtype = '__half'
-            factort = 'Half'
-        elif dtype == dace.float32:
-            cdtype = 'float'
-            factort = 'Float'
-        elif dtype == dace.float64:
-            cdtype = 'double'
-            factort = 'Double'
-        elif dtype == dace.complex64:
-            cdtype = f'{cls.dtype_backend}Complex'
-            factort = 'Complex64'
-        elif dtype == dace.complex128:
-            cdtype = f'{cls.dtype_backend}DoubleComplex'
-            factort = 'Complex128'
-        else:
+        try:
+            blastype, cdtype, factort = cublas_type_metadata(dtype)
+        except TypeError:
             raise ValueError("Unsupported type: " + str(dtype))
+        func = cls.funcname(blastype)
+        # Complex types are named after the backend (e.g., cuComplex or hipComplex)
+        if cdtype.startswith('cu'):
+            cdtype = cls.dtype_backend + cdtype[len('cu'):]
 
         call_prefix = cls.environments[0].handle_setup_code(node)
         call_suffix = ''
 
+        # Lower-precision products are computed through the Lt interface (if available), which chooses
+        # tensor core kernels via heuristics
+        use_lt = dtype in cls.lt_types and node.algorithm is None
+        use_ex = not use_lt and (node.compute_type is not None or node.accumulator_type is not None
+                                 or node.algorithm is not None)
+
+        # Half-precision products accumulate in single precision unless requested otherwise, in which case the
+        # scaling factors are single-precision as well
+        scale_dtype, scale_cdtype = dtype, cdtype
+        if use_lt or use_ex:
+            acctype = cls.get_compute_type(node, dace.float32 if dtype == dace.float16 else dtype)
+            if dtype == dace.float16 and acctype != f'{cls.backend.upper()}BLAS_COMPUTE_16F':
+                scale_dtype, scale_cdtype, factort = dace.float32, 'float', 'Float'
+
+        operands = _get_gemm_operands(node, state, sdfg)
+
+        # Skinny products with a long K dimension do not occupy the GPU with a single product
+        if not needs_copy and not use_lt and not use_ex and dtype in cls.split_k_types:
+            split_k = cls.get_split_k(node, operands)
+            if split_k > 1:
+                return cls.expand_split_k(node, state, sdfg, operands, adesc, bdesc, cdesc, cdtype, factort, func,
+                                          split_k)
+
         # Handle alpha / beta
         constants = {
             1.0: f"__state->{cls.backend}blas_handle.Constants(__dace_cuda_device).{factort}Pone()",
             #-1.0: f"__state->cublas_handle.Constants(__dace_cuda_device).{factort}Mone()",
             0.0: f"__state->{cls.backend}blas_handle.Constants(__dace_cuda_device).{factort}Zero()",
         }
-        if node.alpha not in constants or node.beta not in constants:
+        if use_lt:
+            # Scaling factors are given on the host, in the scale type of the computation
+            call_prefix += f'''
+            {scale_dtype.ctype} __alpha = {scale_dtype.ctype}({node.alpha});
+            {scale_dtype.ctype} __beta = {scale_dtype.ctype}({node.beta});
+            '''
+            alpha = '&__alpha'
+            beta = '&__beta'
+        elif node.alpha not in constants or node.beta not in constants:
             # Deal with complex input constants
             if isinstance(node.alpha, complex):
-                alpha = f'{dtype.ctype}({node.alpha.real}, {node.alpha.imag})'
+                alpha = f'{scale_dtype.ctype}({node.alpha.real}, {node.alpha.imag})'
             else:
-                alpha = f'{dtype.ctype}({node.alpha})'
+                alpha = f'{scale_dtype.ctype}({node.alpha})'
             if isinstance(node.beta, complex):
-                beta = f'{dtype.ctype}({node.beta.real}, {node.beta.imag})'
+                beta = f'{scale_dtype.ctype}({node.beta.real}, {node.beta.imag})'
             else:
-                beta = f'{dtype.ctype}({node.beta})'
+                beta = f'{scale_dtype.ctype}({node.beta})'
 
             # Set pointer mode to host
             call_prefix += f'''{cls.set_pointer_mode}(__dace_{cls.backend}blas_handle, {cls.pointer_host});
-            {dtype.ctype} __alpha = {alpha};
-            {dtype.ctype} __beta = {beta};
+            {scale_dtype.ctype} __alpha = {alpha};
+            {scale_dtype.ctype} __beta = {beta};
             '''
             call_suffix += f'''{cls.set_pointer_mode}(__dace_{cls.backend}blas_handle, {cls.pointer_device});'''
-            alpha = f'({cdtype} *)&__alpha'
-            beta = f'({cdtype} *)&__beta'
+            alpha = f'({scale_cdtype} *)&__alpha'
+            beta = f'({scale_cdtype} *)&__beta'
         else:
             alpha = constants[node.alpha]
             beta = constants[node.beta]
 
         # Set up options for code formatting
-        opt = _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta, cdtype, func)
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     alpha,
+                                     beta,
+                                     cdtype,
+                                     func,
+                                     operands=operands)
         opt['arr_prefix'] = arr_prefix = ''
         if needs_copy:
             opt['arr_prefix'] = arr_prefix = '_conn'
 
+        # Products with a single row or column of C are matrix-vector products (there is no half-precision GEMV)
+        gemv = None
+        if dtype != dace.float16 and not use_ex:
+            gemv = _get_gemv_opts(node, operands)
+
         # Matrix multiplication
-        if (node.compute_type is None and node.accumulator_type is None and node.algorithm is None):
+        if gemv is not None:
+            gemv_func = cls.funcname(blastype, 'gemv')
+            call = f'''{cls.backend}blas{gemv_func}(__dace_{cls.backend}blas_handle,
+                {cls.backend_op(gemv['trans'])},
+                {gemv['rows']}, {gemv['cols']},
+                {alpha},
+                ({cdtype}*){arr_prefix}{gemv['mat']}, {gemv['lda']},
+                ({cdtype}*){arr_prefix}{gemv['vec']}, {gemv['incx']},
+                {beta},
+                ({cdtype}*){arr_prefix}_c, {gemv['incy']});'''
+        elif use_lt:
+            call = f'''
+            __state->{cls.backend}blas_handle.Lt(__dace_cuda_device).Matmul(
+                __dace_current_stream,
+                {{{dtype_to_cudadatatype(dtype)}, {acctype}, {dtype_to_cudadatatype(scale_dtype)},
+                 {cls.backend_op(opt['ta'])}, {cls.backend_op(opt['tb'])},
+                 {opt['M']}, {opt['N']}, {opt['K']}, {opt['lda']}, {opt['ldb']}, {opt['ldc']}}},
+                {alpha}, {arr_prefix}{opt['x']}, {arr_prefix}{opt['y']}, {beta}, {arr_prefix}_c);
+            '''
+        elif not use_ex:
             opt['backend'] = cls.backend
             opt['backend_op_ta'] = cls.backend_op(opt['ta'])
             opt['backend_op_tb'] = cls.backend_op(opt['tb'])
@@ -318,14 +941,6 @@ class ExpandGemmGPUBLAS(ExpandTransformation):
                 {beta},
                 ({dtype}*){arr_prefix}_c, {ldc});'''.format_map(opt)
         else:
-            if node.compute_type is not None:
-                acctype = node.compute_type
-            elif node.accumulator_type is not None:
-                acc_dtype: dtypes.typeclass = node.accumulator_type
-                acctype = f'{cls.backend.upper()}BLAS_COMPUTE_{to_cublas_computetype(acc_dtype)}'
-            else:
-                acctype = f'{cls.backend.upper()}BLAS_COMPUTE_{to_cublas_computetype(dtype)}'
-
             algorithm = f'{cls.backend.upper()}BLAS_GEMM_DEFAULT_TENSOR_OP'
             if node.algorithm is not None:
                 algorithm = node.algorithm
@@ -353,60 +968,227 @@ class ExpandGemmGPUBLAS(ExpandTransformation):
         code = (call_prefix + call + call_suffix)
         tasklet = dace.sdfg.nodes.Tasklet(
             node.name,
-            node.in_connectors,
-            node.out_connectors,
+            *_get_connectors(node, dtype, gemv is not None),
             code,
             language=dace.dtypes.Language.CPP,
         )
 
-        # If buffers are not on the GPU, copy them
+        # If buffers are not on the GPU, copy them. Operands that are already accessible from the GPU are
+        # passed through as-is
         if needs_copy:
             nsdfg = dace.SDFG('nested_gemm')
-            for name, desc in [('_a', adesc), ('_b', bdesc), ('_c', cdesc)]:
-                if isinstance(desc, dt.View):
-                    dcopy = desc.as_array()
-                else:
-                    dcopy = dc(desc)
-                dcopy.lifetime = dtypes.AllocationLifetime.Scope
-                dcopy_gpu = dc(dcopy)
-                dcopy.transient = False
-                nsdfg.add_datadesc(name, dcopy)
-                dcopy_gpu.transient = True
-                dcopy_gpu.storage = dace.StorageType.GPU_Global
-                nsdfg.add_datadesc(name + '_gpu', dcopy_gpu)
             nstate = nsdfg.add_state()
-            a = nstate.add_read('_a')
-            ga = nstate.add_access('_a_gpu')
-            b = nstate.add_read('_b')
-            gb = nstate.add_access('_b_gpu')
-            c = nstate.add_write('_c')
-            gc = nstate.add_access('_c_gpu')
 
             # Reset code and connectors
-            tasklet.in_connectors = {"_conn" + k: None for k in tasklet.in_connectors}
-            tasklet.out_connectors = {"_conn" + k: None for k in tasklet.out_connectors}
-
+            tasklet.in_connectors = {"_conn" + k: v for k, v in tasklet.in_connectors.items()}
+            tasklet.out_connectors = {"_conn" + k: v for k, v in tasklet.out_connectors.items()}
             nstate.add_node(tasklet)
-            nstate.add_nedge(a, ga, dace.Memlet.from_array('_a', adesc))
-            nstate.add_nedge(b, gb, dace.Memlet.from_array('_b', bdesc))
-
-            nstate.add_edge(ga, None, tasklet, '_conn_a', dace.Memlet.from_array('_a_gpu', adesc))
-            nstate.add_edge(gb, None, tasklet, '_conn_b', dace.Memlet.from_array('_b_gpu', bdesc))
-            nstate.add_edge(tasklet, '_conn_c', gc, None, dace.Memlet.from_array('_c_gpu', cdesc))
-            nstate.add_nedge(gc, c, dace.Memlet.from_array('_c', cdesc))
 
+            def stage(name: str, desc: dt.Data, is_input: bool) -> dace.sdfg.nodes.AccessNode:
+                """ Adds an operand to the nested SDFG and returns the access node of its GPU-accessible version. """
+                dcopy = desc.as_array() if isinstance(desc, dt.View) else dc(desc)
+                dcopy.lifetime = dtypes.AllocationLifetime.Scope
+                dcopy.transient = False
+                if name not in nsdfg.arrays:
+                    nsdfg.add_datadesc(name, dcopy)
+                if desc.storage in (dace.StorageType.GPU_Global, dace.StorageType.CPU_Pinned):
+                    return nstate.add_read(name) if is_input else nstate.add_write(name)
+
+                gname = name + '_gpu'
+                if gname not in nsdfg.arrays:
+                    dcopy_gpu = dc(dcopy)
+                    dcopy_gpu.transient = True
+                    dcopy_gpu.storage = dace.StorageType.GPU_Global
+                    nsdfg.add_datadesc(gname, dcopy_gpu)
+                gnode = nstate.add_access(gname)
+                if is_input:
+                    nstate.add_nedge(nstate.add_read(name), gnode, dace.Memlet.from_array(name, desc))
+                else:
+                    nstate.add_nedge(gnode, nstate.add_write(name), dace.Memlet.from_array(name, desc))
+                return gnode
+
+            staged = {
+                name: stage(name, desc, name != '_c')
+                for name, desc in [('_a', adesc), ('_b', bdesc), ('_c', cdesc)]
+            }
+            for name in ('_a', '_b'):
+                nstate.add_edge(staged[name], None, tasklet, '_conn' + name,
+                                dace.Memlet.from_array(staged[name].data, nsdfg.arrays[staged[name].data]))
+            cname = staged['_c'].data
+            nstate.add_edge(tasklet, '_conn_c', staged['_c'], None, dace.Memlet.from_array(cname, nsdfg.arrays[cname]))
+
+            # The product is computed in place, so C is read from the buffer it is written to
             if node.beta != 0.0:
-                rc = nstate.add_read('_c')
-                rgc = nstate.add_access('_c_gpu')
                 tasklet.add_in_connector('_conn_cin')
-                nstate.add_nedge(rc, rgc, dace.Memlet('_c'))
-                nstate.add_edge(rgc, None, tasklet, '_conn_cin', dace.Memlet('_c_gpu'))
+                cin_edge = next((e for e in state.in_edges(node) if e.dst_conn == '_cin'), None)
+                cin_data = state.memlet_path(cin_edge)[0].src.data if cin_edge is not None else None
+                if cin_edge is None or cin_data == cnode.data:
+                    # C is read from the output array
+                    name = '_c' if cin_edge is None else '_cin'
+                    if name not in nsdfg.arrays:
+                        nsdfg.add_datadesc(name, dc(nsdfg.arrays['_c']))
+                    if cname == '_c':
+                        cin = nstate.add_read(name)
+                    else:
+                        cin = nstate.add_access(cname)
+                        nstate.add_nedge(nstate.add_read(name), cin, dace.Memlet.from_array(name, nsdfg.arrays[name]))
+                else:
+                    # C is a different array, which may be broadcast to the shape of the output
+                    cin_shape, cin_strides = _get_cin_shape(node, state, sdfg)
+                    _, cin_desc = nsdfg.add_array('_cin',
+                                                  cin_shape,
+                                                  cdesc.dtype,
+                                                  strides=cin_strides,
+                                                  storage=sdfg.arrays[cin_data].storage)
+                    cin = nstate.add_access(cname)
+                    M, N = cdesc.shape[-2:]
+                    if list(cin_shape) == [M, N]:
+                        csubset = ', '.join(['0'] * (len(cdesc.shape) - 2) + [f'0:{M}', f'0:{N}'])
+                        nstate.add_nedge(nstate.add_read('_cin'), cin,
+                                         dace.Memlet(data='_cin', subset=f'0:{M}, 0:{N}', other_subset=csubset))
+                    else:
+                        cidx = ', '.join(['0'] * (len(cdesc.shape) - 2) + ['__i0', '__i1'])
+                        gcin = stage('_cin', cin_desc, True)
+                        cin_idx = _get_broadcast_index(cin_shape, M, N, '__i0', '__i1')
+                        nstate.add_mapped_tasklet('gemm_broadcast_cin',
+                                                  dict(__i0=f'0:{M}', __i1=f'0:{N}'),
+                                                  {'__in': dace.Memlet(f'{gcin.data}[{cin_idx}]')},
+                                                  '__out = __in', {'__out': dace.Memlet(f'{cname}[{cidx}]')},
+                                                  schedule=dtypes.ScheduleType.GPU_Device,
+                                                  input_nodes={gcin.data: gcin},
+                                                  output_nodes={cname: cin},
+                                                  external_edges=True)
+                nstate.add_edge(cin, None, tasklet, '_conn_cin',
+                                dace.Memlet.from_array(cin.data, nsdfg.arrays[cin.data]))
 
             return nsdfg
         # End of copy to GPU
 
         return tasklet
 
+    @classmethod
+    def get_compute_type(cls, node, default_dtype: dtypes.typeclass) -> str:
+        """ Returns the computation type of the product as set on the node, or based on the given default type. """
+        if node.compute_type is not None:
+            return node.compute_type
+        acc_dtype = node.accumulator_type if node.accumulator_type is not None else default_dtype
+        return f'{cls.backend.upper()}BLAS_COMPUTE_{to_cublas_computetype(acc_dtype)}'
+
+    @classmethod
+    def get_split_k(cls, node, operands) -> int:
+        """
+        Returns the number of chunks that the K dimension of the given GEMM is split into, or 1 if K is not split.
+        Unless set on the node, K is only split if the problem size is known at compile time, the output is too
+        small to occupy the GPU, and K divides evenly into chunks of sufficient length.
+        """
+        (_, _, ashape, _), (_, _, bshape, _), _ = operands
+        M, K = reversed(ashape) if node.transA else ashape
+        N = bshape[0] if node.transB else bshape[1]
+        if node.split_k is not None:
+            if dace.symbolic.issymbolic(K) or int(K) % node.split_k != 0:
+                raise ValueError(f'Cannot split K dimension of size {K} into {node.split_k} chunks')
+            return node.split_k
+        if any(dace.symbolic.issymbolic(s) for s in (M, N, K)):
+            return 1
+        M, N, K = int(M), int(N), int(K)
+        if M == 1 or N == 1:
+            # Matrix-vector products are computed with GEMV
+            return 1
+        tiles = -(-M // cls.split_k_tile) * -(-N // cls.split_k_tile)
+        max_split = min(cls.split_k_blocks // tiles, K // cls.split_k_min_chunk, cls.split_k_max)
+        return next((s for s in range(max_split, 1, -1) if K % s == 0), 1)
+
+    @classmethod
+    def expand_split_k(cls, node, state, sdfg, operands, adesc, bdesc, cdesc, cdtype: str, factort: str, func: str,
+                       split_k: int) -> SDFG:
+        """
+        Expands the given GEMM to a strided batched product of the ``split_k`` chunks of K into a workspace, followed
+        by a map that reduces the partial products and adds C.
+        """
+        from dace.codegen.common import sym2cpp  # Avoid import loop
+
+        (_, _, ashape, astrides), (_, _, bshape, bstrides), (cedge, _, cshape, cstrides) = operands
+        dtype = adesc.dtype.base_type
+        M, N = cshape
+        K = ashape[0] if node.transA else ashape[1]
+        chunk = int(K) // split_k
+
+        nsdfg = dace.SDFG(node.label + '_split_k')
+        nsdfg.add_array('_a', ashape, dtype, strides=astrides, storage=adesc.storage)
+        nsdfg.add_array('_b', bshape, dtype, strides=bstrides, storage=bdesc.storage)
+        nsdfg.add_array('_c', cshape, dtype, strides=cstrides, storage=cdesc.storage)
+        cin_name, cin_idx = _add_cin(node, state, sdfg, nsdfg, M, N, dtype, cdesc.storage, '__i0', '__i1')
+
+        # Partial products are stored in the layout of C, so that the options of the batched product match
+        ws_strides = [1, M] if cstrides[0] == 1 else [N, 1]
+        nsdfg.add_array('_ws', [split_k, M, N],
+                        dtype,
+                        strides=[M * N] + ws_strides,
+                        storage=dtypes.StorageType.GPU_Global,
+                        lifetime=dtypes.AllocationLifetime.Persistent,
+                        transient=True)
+        ws_operands = (operands[0], operands[1], (cedge, nsdfg.arrays['_ws'], cshape, ws_strides))
+        opt = _get_codegen_gemm_opts(node,
+                                     state,
+                                     sdfg,
+                                     adesc,
+                                     bdesc,
+                                     cdesc,
+                                     None,
+                                     None,
+                                     cdtype,
+                                     func,
+                                     operands=ws_operands)
+
+        # The chunks of the product are strided along K in both operands
+        kstrides = {
+            '_a': astrides[0] if node.transA else astrides[1],
+            '_b': bstrides[1] if node.transB else bstrides[0]
+        }
+        constants = f'__state->{cls.backend}blas_handle.Constants(__dace_cuda_device)'
+        code = cls.environments[0].handle_setup_code(node) + f'''
+            {cls.backend}blas{cls.funcname(to_blastype(dtype.type), 'gemmStridedBatched')}(__dace_{cls.backend}blas_handle,
+                {cls.backend_op(opt['ta'])}, {cls.backend_op(opt['tb'])},
+                {opt['M']}, {opt['N']}, {chunk},
+                {constants}.{factort}Pone(),
+                ({cdtype}*){opt['x']}, {opt['lda']}, {sym2cpp(chunk * kstrides[opt['x']])},
+                ({cdtype}*){opt['y']}, {opt['ldb']}, {sym2cpp(chunk * kstrides[opt['y']])},
+                {constants}.{factort}Zero(),
+                ({cdtype}*)_ws, {opt['ldc']}, {sym2cpp(M * N)},
+                {split_k});'''
+
+        gemm_state = nsdfg.add_state(node.label + '_partial')
+        tasklet = gemm_state.add_tasklet(node.name, {
+            '_a': dtypes.pointer(dtype),
+            '_b': dtypes.pointer(dtype)
+        }, {'_ws': dtypes.pointer(dtype)},
+                                         code,
+                                         language=dace.dtypes.Language.CPP)
+        for name in ('_a', '_b'):
+            gemm_state.add_edge(gemm_state.add_read(name), None, tasklet, name,
+                                dace.Memlet.from_array(name, nsdfg.arrays[name]))
+        gemm_state.add_edge(tasklet, '_ws', gemm_state.add_write('_ws'), None,
+                            dace.Memlet.from_array('_ws', nsdfg.arrays['_ws']))
+
+        # Sum up the partial products, scale by alpha, and add C
+        inputs = {f'__p{s}': dace.Memlet(f'_ws[{s}, __i0, __i1]') for s in range(split_k)}
+        if cin_name is not None:
+            inputs['__c'] = dace.Memlet.simple(cin_name, cin_idx)
+        acc = '(' + ' + '.join(f'__p{s}' for s in range(split_k)) + ')'
+        epilogue = '__y = ' + _get_epilogue_expr(node, dtype.type, acc, '__c' if cin_name else None)
+
+        reduce_state = nsdfg.add_state_after(gemm_state, node.label + '_reduce')
+        reduce_state.add_mapped_tasklet('gemm_reduce', {
+            '__i0': f'0:{symstr(M)}',
+            '__i1': f'0:{symstr(N)}'
+        },
+                                        inputs,
+                                        epilogue, {'__y': dace.Memlet('_c[__i0, __i1]')},
+                                        schedule=dtypes.ScheduleType.GPU_Device,
+                                        external_edges=True)
+
+        return nsdfg
+
 
 @dace.library.expansion
 class ExpandGemmCuBLAS(ExpandGemmGPUBLAS):
@@ -417,14 +1199,16 @@ class ExpandGemmCuBLAS(ExpandGemmGPUBLAS):
     pointer_host = 'CUBLAS_POINTER_MODE_HOST'
     pointer_device = 'CUBLAS_POINTER_MODE_DEVICE'
     ex_suffix = 'GemmEx'
+    lt_types = (dace.float16, )
+    split_k_types = (dace.float32, dace.float64, dace.complex64, dace.complex128)
 
     @classmethod
     def backend_op(cls, mode: str) -> str:
         return f'CUBLAS_OP_{mode}'
 
     @classmethod
-    def funcname(cls, dtype: str) -> str:
-        return f'{dtype}gemm'
+    def funcname(cls, dtype: str, op: str = 'gemm') -> str:
+        return f'{dtype}{op}'
 
 
 @dace.library.expansion
@@ -436,6 +1220,8 @@ class ExpandGemmRocBLAS(ExpandGemmGPUBLAS):
     pointer_host = 'rocblas_pointer_mode_host'
     pointer_device = 'rocblas_pointer_mode_device'
     ex_suffix = '_gemm_ex'
+    lt_types = ()
+    split_k_types = ()
 
     @classmethod
     def backend_op(cls, mode: str) -> str:
@@ -446,8 +1232,8 @@ class ExpandGemmRocBLAS(ExpandGemmGPUBLAS):
         raise ValueError(f'Invalid gemm matrix operation {mode}')
 
     @classmethod
-    def funcname(cls, dtype: str) -> str:
-        return f'_{dtype.lower()}gemm'
+    def funcname(cls, dtype: str, op: str = 'gemm') -> str:
+        return f'_{dtype.lower()}{op}'
 
 
 @dace.library.expansion
@@ -458,7 +1244,7 @@ class ExpandGemmPBLAS(ExpandTransformation):
     @staticmethod
     def expansion(node, state, sdfg):
         node.validate(sdfg, state)
-        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = _get_matmul_operands(node, state, sdfg)
+        (_, adesc, ashape, astrides), (_, bdesc, bshape, bstrides), _ = _get_gemm_operands(node, state, sdfg)
         dtype = adesc.dtype.base_type
 
         if node.beta != 0:
@@ -514,7 +1300,7 @@ class ExpandGemmFPGA1DSystolic(ExpandTransformation):
         """
 
         ((edge_a, outer_array_a, shape_a, strides_a), (edge_b, outer_array_b, shape_b, strides_b),
-         (edge_c, outer_array_c, shape_c, strides_c)) = _get_matmul_operands(node, parent_state, parent_sdfg)
+         (edge_c, outer_array_c, shape_c, strides_c)) = _get_gemm_operands(node, parent_state, parent_sdfg)
 
         dtype_a = outer_array_a.dtype.type
         dtype_b = outer_array_b.dtype.type
@@ -960,8 +1746,10 @@ class Gemm(dace.sdfg.nodes.LibraryNode):
     # Global properties
     implementations = {
         "pure": ExpandGemmPure,
+        "pure-blocked": ExpandGemmPureBlocked,
         "MKL": ExpandGemmMKL,
         "OpenBLAS": ExpandGemmOpenBLAS,
+        "LIBXSMM": ExpandGemmLIBXSMM,
         "cuBLAS": ExpandGemmCuBLAS,
         "rocBLAS": ExpandGemmRocBLAS,
         "PBLAS": ExpandGemmPBLAS,
@@ -984,6 +1772,11 @@ class Gemm(dace.sdfg.nodes.LibraryNode):
                                     default=None,
                                     desc="If applicable, chooses the vendor-provided implementation "
                                     "(algorithm) for the multiplication")
+    split_k = properties.Property(dtype=int,
+                                  allow_none=True,
+                                  default=None,
+                                  desc="If applicable, the number of chunks that K is split into, whose partial "
+                                  "products are summed afterwards. If None, chosen by problem size (cuBLAS-specific)")
     accumulator_type = properties.TypeClassProperty(
         default=None,
         choices=dtypes.Typeclasses,
@@ -994,6 +1787,11 @@ class Gemm(dace.sdfg.nodes.LibraryNode):
                                        allow_none=True,
                                        desc="If applicable, overrides computation type (CUBLAS-specific, see "
                                        "``cublasComputeType_t``)")
+    packed_operand = properties.Property(dtype=str,
+                                         allow_none=True,
+                                         default=None,
+                                         desc="If set, the operand ('_a' or '_b') that was packed ahead of time and "
+                                         "is provided through the ``_packed`` connector (MKL-specific)")
 
     def __init__(self, name, location=None, transA=False, transB=False, alpha=1, beta=0, cin=True):
         super().__init__(name,
@@ -1007,19 +1805,17 @@ class Gemm(dace.sdfg.nodes.LibraryNode):
         self.cin = cin
 
     def validate(self, sdfg, state):
-        in_edges = state.in_edges(self)
+        if self.split_k is not None and self.split_k < 1:
+            raise ValueError("Number of K chunks (split_k) must be positive, got {}".format(self.split_k))
+        in_edges = [e for e in state.in_edges(self) if e.dst_conn != '_packed']
         if len(in_edges) not in [2, 3]:
             raise ValueError("Expected 2 or 3 inputs to gemm")
         size2 = None
         for _, _, _, dst_conn, memlet in state.in_edges(self):
             if dst_conn == '_a':
-                subset = dc(memlet.subset)
-                subset.squeeze()
-                size0 = subset.size()
+                size0 = [memlet.subset.size()[i] for i in _get_matrix_dims(memlet.subset)]
             if dst_conn == '_b':
-                subset = dc(memlet.subset)
-                subset.squeeze()
-                size1 = subset.size()
+                size1 = [memlet.subset.size()[i] for i in _get_matrix_dims(memlet.subset)]
             if dst_conn == '_c':
                 subset = dc(memlet.subset)
                 subset.squeeze()
@@ -1043,9 +1839,7 @@ class Gemm(dace.sdfg.nodes.LibraryNode):
                           UserWarning)
         elif not res:
             raise ValueError("Inputs to matrix-matrix product must agree in the k-dimension")
-        out_subset = dc(out_memlet.subset)
-        out_subset.squeeze()
-        size3 = out_subset.size()
+        size3 = [out_memlet.subset.size()[i] for i in _get_matrix_dims(out_memlet.subset)]
         if size2 is not None:
             res = [equal(s0, s1) for s0, s1 in zip(size2, size3)]
             fail = any([r is False for r in res])
@@ -2,7 +2,10 @@
 import dace
 from dace import properties, symbolic
 from copy import deepcopy as dc
-from typing import Any, Dict
+import functools
+import operator
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 import warnings
 
 
@@ -35,57 +38,119 @@ def _get_matmul_operands(node, state, sdfg, name_lhs="_a", name_rhs="_b", name_o
     return res_lhs, res_rhs, res_out
 
 
-def _get_batchmm_opts(a_shape, a_strides, b_shape, b_strides, c_shape, c_strides) -> Dict[str, Any]:
+# Returned for non-batched products. Read-only, as the options of batched products may be modified by callers
+_EMPTY_BATCHMM_OPTS: Mapping[str, Any] = MappingProxyType({})
+
+
+def _get_batch_stride(shape, strides) -> Any:
+    """
+    Returns the distance between consecutive matrices of a tensor whose leading (batch) dimensions are traversed in
+    row-major order, 0 if the tensor is a single matrix, or None if the matrices are not evenly spaced.
+    """
+    if len(shape) <= 2:
+        return 0
+    for i in range(len(shape) - 4, -1, -1):
+        if symbolic.equal(strides[i], strides[i + 1] * shape[i + 1]) is not True:
+            return None
+    return strides[-3]
+
+
+def _get_batch_offset(batch_shape, batch_strides, index: str = '__ib') -> str:
+    """
+    Returns the C++ expression for the offset of the matrix at a flattened (row-major) batch index, given the
+    strides of the batch dimensions of its tensor.
+    """
+    from dace.codegen.common import sym2cpp  # Avoid import loop
+
+    terms = []
+    inner = 1
+    for i in range(len(batch_shape) - 1, -1, -1):
+        idx = index if inner == 1 else f'({index} / {sym2cpp(inner)})'
+        if i > 0:
+            idx = f'({idx} % {sym2cpp(batch_shape[i])})'
+        inner *= batch_shape[i]
+        if batch_strides[i] != 0:
+            terms.append(f'{idx}*{sym2cpp(batch_strides[i])}')
+    return ' + '.join(terms) or '0'
+
+
+def _get_batchmm_opts(a_shape, a_strides, b_shape, b_strides, c_shape, c_strides) -> Mapping[str, Any]:
     """
     Detects whether a matrix multiplication is a batched matrix multiplication
     and returns its parameters (strides, batch size), or an empty dictionary if
-    batched multiplication is not detected.
+    batched multiplication is not detected. All dimensions but the last two
+    are batch dimensions.
+
+    If the matrices of each tensor are evenly spaced, the multiplication is
+    ``strided`` and the strides are the distances between consecutive matrices.
+    Otherwise (e.g., for a view with permuted batch dimensions), the
+    multiplication operates on ``pointers`` to the individual matrices and the
+    strides are given per batch dimension.
     
     :param a: Data descriptor for the first tensor.
     :param b: Data descriptor for the second tensor.
     :param c: Data descriptor for the output tensor (optional).
-    :return: A dictionary with the following keys: sa,sb,sc (strides for a, b,
-             and c); and b (batch size).
+    :return: A dictionary with the following keys: mode (``strided`` or
+             ``pointers``); sa,sb,sc (strides for a, b, and c); b (batch
+             size); and shape (batch dimensions).
     """
-    if len(a_shape) > 3 or len(b_shape) > 3 or (c_shape and len(c_shape) > 3):
-        raise ValueError('Tensor dimensions too large for (batched) matrix ' 'multiplication')
-    if len(a_shape) <= 2 and len(b_shape) <= 2:
-        return {}
-
-    batch = None
-    stride_a, stride_b, stride_c = 0, 0, 0
-    if len(a_shape) == 3:
-        batch = a_shape[0]
-        stride_a = a_strides[0]
-    if len(b_shape) == 3:
-        if batch is not None:
-            res = symbolic.equal(batch, b_shape[0])
-            if res is None:
-                warnings.warn(f'Batch size of first tensor ({batch}) may not match second tensor ({b_shape[0]})',
-                              UserWarning)
-            elif not res:
-                raise ValueError('Batch size mismatch for matrix multiplication')
-        batch = b_shape[0]
-        stride_b = b_strides[0]
-    if c_shape and len(c_shape) == 3:
-        if batch and batch != c_shape[0]:
+    la, lb, lc = len(a_shape), len(b_shape), (len(c_shape) if c_shape else 0)
+    if la <= 2 and lb <= 2:
+        return _EMPTY_BATCHMM_OPTS
+
+    if la > 2 and lb > 2:
+        if la != lb:
+            raise ValueError('Batch dimensions mismatch for matrix multiplication')
+        res = [symbolic.equal(sa, sb) for sa, sb in zip(a_shape[:-2], b_shape[:-2])]
+        if any(r is False for r in res):
             raise ValueError('Batch size mismatch for matrix multiplication')
-        batch = c_shape[0]
-        stride_c = c_strides[0]
+        elif any(r is None for r in res):
+            warnings.warn(f'Batch size of first tensor ({a_shape[:-2]}) may not match second tensor ({b_shape[:-2]})',
+                          UserWarning)
+    batch_shape = list(b_shape[:-2] if lb > 2 else a_shape[:-2])
+    if lc > 2:
+        if lc != len(batch_shape) + 2 or any(bs and bs != cs for bs, cs in zip(batch_shape, c_shape[:-2])):
+            raise ValueError('Batch size mismatch for matrix multiplication')
+        batch_shape = list(c_shape[:-2])
+    batch = functools.reduce(operator.mul, batch_shape)
+
+    operands = ((a_shape, a_strides), (b_shape, b_strides), (c_shape or [], c_strides or []))
+    sa, sb, sc = (_get_batch_stride(shape, strides) for shape, strides in operands)
+    if sa is not None and sb is not None and sc is not None:
+        return {'mode': 'strided', 'sa': sa, 'sb': sb, 'sc': sc, 'b': batch, 'shape': batch_shape}
 
-    if batch is None:
-        return {}
+    # Matrices are addressed individually
+    sa, sb, sc = (list(strides[:-2]) if len(shape) > 2 else [0] * len(batch_shape) for shape, strides in operands)
+    return {'mode': 'pointers', 'sa': sa, 'sb': sb, 'sc': sc, 'b': batch, 'shape': batch_shape}
 
-    return {'sa': stride_a, 'sb': stride_b, 'sc': stride_c, 'b': batch}
 
+def _get_codegen_gemm_opts(node,
+                           state,
+                           sdfg,
+                           adesc,
+                           bdesc,
+                           cdesc,
+                           alpha,
+                           beta,
+                           cdtype,
+                           func,
+                           row_major: bool = False,
+                           operands: Optional[Tuple[Tuple[Any, ...], ...]] = None) -> Dict[str, Any]:
+    """
+    Get option map for GEMM code generation (with column-major order).
 
-def _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta, cdtype, func) -> Dict[str, Any]:
-    """ Get option map for GEMM code generation (with column-major order). """
+    :param row_major: If True, a row-major C is not computed as the transposed product in column-major order.
+                      Instead, the operands stay in place and the ``layout`` option is set to ``CblasRowMajor``.
+                      Only applicable to CBLAS interfaces.
+    :param operands: The result of ``_get_matmul_operands`` for the node, if already computed by the caller.
+    """
     # Avoid import loops
     from dace.codegen.common import sym2cpp
     from dace.libraries.blas.blas_helpers import get_gemm_opts
 
-    (_, _, ashape, astride), (_, _, bshape, bstride), (_, _, cshape, cstride) = _get_matmul_operands(node, state, sdfg)
+    if operands is None:
+        operands = _get_matmul_operands(node, state, sdfg)
+    (_, _, ashape, astride), (_, _, bshape, bstride), (_, _, cshape, cstride) = operands
 
     if getattr(node, 'transA', False):
         ashape = list(reversed(ashape))
@@ -109,7 +174,12 @@ def _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta,
     opt['ldb'] = sym2cpp(opt['ldb'])
     opt['ldc'] = sym2cpp(opt['ldc'])
 
-    if opt['swap']:
+    opt['layout'] = 'CblasColMajor'
+    if opt['swap'] and row_major:
+        # CBLAS performs the same operand swap internally
+        opt['swap'] = False
+        opt['layout'] = 'CblasRowMajor'
+    elif opt['swap']:
         if bopt:
             bopt['sa'], bopt['sb'] = bopt['sb'], bopt['sa']
         opt['lda'], opt['ldb'] = opt['ldb'], opt['lda']
@@ -122,17 +192,31 @@ def _get_codegen_gemm_opts(node, state, sdfg, adesc, bdesc, cdesc, alpha, beta,
     opt['beta'] = beta
     opt['dtype'] = cdtype
     opt['func'] = func
-    if bopt:
+    if bopt and bopt['mode'] == 'strided':
         opt['stride_a'] = sym2cpp(bopt['sa'])
         opt['stride_b'] = sym2cpp(bopt['sb'])
         opt['stride_c'] = sym2cpp(bopt['sc'])
         opt['BATCH'] = sym2cpp(bopt['b'])
+        for k in 'abc':
+            opt['offset_' + k] = f"__ib*{opt['stride_' + k]}"
+    elif bopt:
+        # Matrices are not evenly spaced, their offsets are computed from the batch index ``__ib``
+        opt['stride_a'] = opt['stride_b'] = opt['stride_c'] = None
+        opt['BATCH'] = sym2cpp(bopt['b'])
+        for k in 'abc':
+            opt['offset_' + k] = _get_batch_offset(bopt['shape'], bopt['s' + k])
     else:
         opt['BATCH'] = None
 
     return opt
 
 
+def _all_static(opt: Dict[str, Any]) -> bool:
+    """ Returns True if the problem size and leading dimensions in the given GEMM code generation options
+        are integer literals, i.e., known at compile time. """
+    return all(str(opt[k]).isdigit() for k in ('M', 'N', 'K', 'lda', 'ldb', 'ldc'))
+
+
 @dace.library.expansion
 class SpecializeMatMul(dace.transformation.transformation.ExpandTransformation):
 
@@ -160,7 +244,7 @@ class SpecializeMatMul(dace.transformation.transformation.ExpandTransformation):
                     warnings.warn("Unsupported WCR in output of MatMul " "library node: {}".format(c[0].data.wcr))
             gemm = Gemm(node.name + 'gemm', location=node.location, alpha=node.alpha, beta=beta, cin=cin)
             return gemm
-        elif len(size_b) == 3 and (len(size_a) in [2, 3]):
+        elif len(size_b) >= 3 and (len(size_a) in [2, len(size_b)]):
             # Batched matrix and matrix -> batched matrix multiplication
             from dace.libraries.blas.nodes.batched_matmul import BatchedMatMul
             result = BatchedMatMul(node.name + 'bmm', location=node.location)
@@ -55,6 +55,7 @@ from .hbm_transform import HbmTransform
 # Algorithmic
 from .matrix_product_transpose import MatrixProductTranspose
 from .lift_einsum import LiftEinsum
+from .gemm_pack import FuseSequentialGemmPack
 
 # Distributions
 from .map_distribution import (ElementWiseArrayOperation, ElementWiseArrayOperation2D, RedundantComm2D)
\ No newline at end of file
@@ -0,0 +1,149 @@
+# Copyright 2019-2023 ETH Zurich and the DaCe authors. All rights reserved.
+""" Implements a transformation that packs GEMM operands shared by multiple products once. """
+
+from copy import deepcopy as dcpy
+from typing import Any, Dict, Optional
+
+import dace
+from dace import dtypes
+from dace.sdfg import nodes, graph as gr
+from dace.sdfg.sdfg import SDFG
+from dace.sdfg.state import SDFGState
+from dace.transformation import transformation
+from dace.properties import make_properties
+
+
+@make_properties
+class FuseSequentialGemmPack(transformation.SingleStateTransformation):
+    """ Packs a matrix that is consumed by several GEMMs only once, using the
+        packed API of Intel MKL (``cblas_?gemm_pack``/``cblas_?gemm_compute``).
+
+        All matching ``Gemm`` nodes that read the same array with the same
+        problem size, operand layout, and alpha are rewired to read the packed
+        buffer, which is freed after the last product finishes. This typically
+        occurs with weight matrices that are applied to several inputs in a row.
+        The products are set to use the MKL implementation.
+    """
+    import dace.libraries.blas as blas  # Avoid slow imports
+
+    array = transformation.PatternNode(nodes.AccessNode)
+    first = transformation.PatternNode(blas.Gemm)
+    second = transformation.PatternNode(blas.Gemm)
+
+    @classmethod
+    def expressions(cls):
+        graph = gr.OrderedDiGraph()
+        graph.add_node(cls.array)
+        graph.add_node(cls.first)
+        graph.add_node(cls.second)
+        graph.add_edge(cls.array, cls.first, None)
+        graph.add_edge(cls.array, cls.second, None)
+        return [graph]
+
+    def _pack_options(self, graph: SDFGState, sdfg: SDFG, gemm) -> Optional[Dict[str, Any]]:
+        """ Returns the packing parameters of the array for the given GEMM, or None if it cannot be packed. """
+        from dace.libraries.blas.nodes.gemm import Gemm
+        from dace.libraries.blas.nodes.matmul import _get_matmul_operands, _get_codegen_gemm_opts
+
+        if not isinstance(gemm, Gemm) or gemm.packed_operand is not None:
+            return None
+        if graph.entry_node(gemm) is not None:
+            return None
+        edges = graph.edges_between(self.array, gemm)
+        if len(edges) != 1 or edges[0].dst_conn not in ('_a', '_b'):
+            return None
+        conn = edges[0].dst_conn
+
+        try:
+            operands = _get_matmul_operands(gemm, graph, sdfg)
+            (_, adesc, _, _), (_, bdesc, _, _), (_, cdesc, _, _) = operands
+            dtype = adesc.dtype.base_type
+            if dtype not in (dace.float32, dace.float64) or any(desc.dtype.base_type != dtype
+                                                                for desc in (bdesc, cdesc)):
+                return None
+            opt = _get_codegen_gemm_opts(gemm,
+                                         graph,
+                                         sdfg,
+                                         adesc,
+                                         bdesc,
+                                         cdesc,
+                                         None,
+                                         None,
+                                         dtype.ctype,
+                                         None,
+                                         row_major=True,
+                                         operands=operands)
+        except (ValueError, NotImplementedError):
+            return None
+        if any(desc.storage not in (dtypes.StorageType.Default, dtypes.StorageType.CPU_Heap,
+                                    dtypes.StorageType.CPU_Pinned) for desc in (adesc, bdesc, cdesc)):
+            return None
+
+        if opt['x'] == conn:
+            matrix, trans, ld = 'CblasAMatrix', opt['ta'], opt['lda']
+        else:
+            matrix, trans, ld = 'CblasBMatrix', opt['tb'], opt['ldb']
+
+        return dict(conn=conn,
+                    layout=opt['layout'],
+                    subset=str(edges[0].data.subset),
+                    dtype=dtype,
+                    matrix=matrix,
+                    trans='CblasNoTrans' if trans == 'N' else 'CblasTrans',
+                    ld=ld,
+                    M=opt['M'],
+                    N=opt['N'],
+                    K=opt['K'],
+                    alpha=f'{dtype.ctype}({gemm.alpha})')
+
+    def can_be_applied(self, graph, expr_index, sdfg, permissive=False):
+        if graph.entry_node(self.array) is not None:
+            return False
+        opt = self._pack_options(graph, sdfg, self.first)
+        if opt is None:
+            return False
+        return opt == self._pack_options(graph, sdfg, self.second)
+
+    def match_to_str(self, graph):
+        return f"{self.first.name} <- {self.array.data} -> {self.second.name}"
+
+    def apply(self, graph: SDFGState, sdfg: SDFG):
+        from dace.libraries.blas import environments
+
+        array = self.array
+        opt = self._pack_options(graph, sdfg, self.first)
+        consumers = [g for g in graph.successors(array) if self._pack_options(graph, sdfg, g) == opt]
+        func = 'cblas_' + ('s' if opt['dtype'] == dace.float32 else 'd') + 'gemm'
+        env = {environments.intel_mkl.IntelMKL.full_class_path()}
+
+        ptr_name, ptr_desc = sdfg.add_scalar('gemm_packed',
+                                             dace.pointer(opt['dtype']),
+                                             transient=True,
+                                             find_new_name=True)
+
+        # Allocate and pack
+        pack = graph.add_tasklet('gemm_pack', {opt['conn']}, {'__out'},
+                                 ("__out = {func}_alloc({matrix}, {M}, {N}, {K});\n"
+                                  "{func}_pack({layout}, {matrix}, {trans}, {M}, {N}, {K}, {alpha}, {conn}, "
+                                  "{ld}, __out);").format(func=func, **opt),
+                                 language=dtypes.Language.CPP)
+        pack.environments = env
+        memlet = dcpy(graph.edges_between(array, self.first)[0].data)
+        graph.add_edge(array, None, pack, opt['conn'], memlet)
+        packed = graph.add_access(ptr_name)
+        graph.add_edge(pack, '__out', packed, None, dace.Memlet.from_array(ptr_name, ptr_desc))
+
+        # Rewire products. The free has no outputs, so it must be kept alive explicitly
+        free = graph.add_tasklet('gemm_pack_free', {'__in'}, {},
+                                 f'{func}_free(__in);',
+                                 language=dtypes.Language.CPP,
+                                 side_effects=True)
+        free.environments = env
+        graph.add_edge(packed, None, free, '__in', dace.Memlet.from_array(ptr_name, ptr_desc))
+        for gemm in consumers:
+            gemm.packed_operand = opt['conn']
+            gemm.implementation = 'MKL'
+            gemm.add_in_connector('_packed')
+            graph.add_edge(packed, None, gemm, '_packed', dace.Memlet.from_array(ptr_name, ptr_desc))
+            for e in graph.out_edges(gemm):
+                graph.add_nedge(e.dst, free, dace.Memlet())
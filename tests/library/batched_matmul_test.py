@@ -13,6 +13,8 @@ from dace.library import change_default
     pytest.param("pure", dace.float64),
     pytest.param("MKL", dace.float32, marks=pytest.mark.mkl),
     pytest.param("MKL", dace.float64, marks=pytest.mark.mkl),
+    pytest.param("LIBXSMM", dace.float32, marks=pytest.mark.libxsmm),
+    pytest.param("LIBXSMM", dace.float64, marks=pytest.mark.libxsmm),
     pytest.param("cuBLAS", dace.float32, marks=pytest.mark.gpu),
     pytest.param("cuBLAS", dace.float64, marks=pytest.mark.gpu)
 ])
@@ -42,10 +44,85 @@ def test_batchmm(implementation: str, dtype):
         assert np.allclose(ref, z)
 
 
+@pytest.mark.parametrize("implementation", [
+    pytest.param("pure"),
+    pytest.param("MKL", marks=pytest.mark.mkl),
+    pytest.param("LIBXSMM", marks=pytest.mark.libxsmm),
+    pytest.param("cuBLAS", marks=pytest.mark.gpu)
+])
+@pytest.mark.parametrize("permuted", [False, True])
+def test_batchmm_multiple_batch_dims(implementation: str, permuted: bool):
+    b, h, m, n, k = 2, 3, 32, 31, 30
+
+    # If the batch dimensions of A are permuted, its matrices are not evenly spaced
+    a_strides = (m * k, b * m * k, k, 1) if permuted else (h * m * k, m * k, k, 1)
+    adesc = dace.data.Array(dace.float64, [b, h, m, k], strides=a_strides, total_size=b * h * m * k)
+
+    @dace.program
+    def bmm_batch_dims(A: adesc, B: dace.float64[b, h, k, n], C: dace.float64[b, h, m, n]):
+        C[:] = A @ B
+
+    with change_default(blas, implementation):
+        sdfg = bmm_batch_dims.to_sdfg()
+        sdfg.simplify()
+        sdfg.expand_library_nodes()
+
+        x = np.random.rand(h, b, m, k).transpose(1, 0, 2, 3) if permuted else np.random.rand(b, h, m, k)
+        y = np.random.rand(b, h, k, n)
+        z = np.zeros([b, h, m, n])
+
+        with dace.config.set_temporary('compiler', 'allow_view_arguments', value=True):
+            sdfg(A=x, B=y, C=z)
+
+        assert np.allclose(x @ y, z)
+
+
+@pytest.mark.libxsmm
+@pytest.mark.parametrize("symbolic", [False, True])
+def test_batchmm_libxsmm_dispatch(symbolic: bool):
+    b, m, n, k = tuple(dace.symbol(k) for k in 'bmnk') if symbolic else (3, 32, 31, 30)
+
+    @dace.program
+    def bmm_libxsmm(A: dace.float32[b, m, k], B: dace.float32[b, k, n], C: dace.float32[b, m, n]):
+        C[:] = A @ B
+
+    with change_default(blas, "LIBXSMM"):
+        sdfg = bmm_libxsmm.to_sdfg()
+        sdfg.simplify()
+        sdfg.expand_library_nodes()
+
+        # Kernels of fixed-size products are dispatched once, on initialization
+        tasklet = next(n for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.Tasklet))
+        if symbolic:
+            assert not tasklet.state_fields
+            assert 'libxsmm_smmdispatch(' in tasklet.code.as_string
+        else:
+            assert len(tasklet.state_fields) == 1
+            assert 'libxsmm_smmdispatch(' in tasklet.code_init.as_string
+            assert 'libxsmm_smmdispatch(' not in tasklet.code.as_string
+
+        sizes = dict(b=3, m=32, n=31, k=30) if symbolic else {}
+        x = np.random.rand(3, 32, 30).astype(np.float32)
+        y = np.random.rand(3, 30, 31).astype(np.float32)
+        z = np.zeros([3, 32, 31], dtype=np.float32)
+        sdfg(A=x, B=y, C=z, **sizes)
+
+        assert np.allclose(x @ y, z)
+
+
 if __name__ == "__main__":
     test_batchmm("pure", dace.float32)
     test_batchmm("pure", dace.float64)
     test_batchmm("MKL", dace.float32)
     test_batchmm("MKL", dace.float64)
+    test_batchmm("LIBXSMM", dace.float32)
+    test_batchmm("LIBXSMM", dace.float64)
     test_batchmm("cuBLAS", dace.float32)
     test_batchmm("cuBLAS", dace.float64)
+    test_batchmm_multiple_batch_dims("pure", False)
+    test_batchmm_multiple_batch_dims("pure", True)
+    test_batchmm_multiple_batch_dims("MKL", True)
+    test_batchmm_multiple_batch_dims("LIBXSMM", True)
+    test_batchmm_multiple_batch_dims("cuBLAS", True)
+    test_batchmm_libxsmm_dispatch(False)
+    test_batchmm_libxsmm_dispatch(True)
@@ -16,10 +16,10 @@ L = dace.symbol('L')
 O = dace.symbol('O')
 
 
-@pytest.mark.parametrize(
-    ('implementation', ),
-    [('pure', ), pytest.param('MKL', marks=pytest.mark.mkl),
-     pytest.param('cuBLAS', marks=pytest.mark.gpu)])
+@pytest.mark.parametrize(('implementation', ), [('pure', ), ('pure-blocked', ),
+                                                pytest.param('MKL', marks=pytest.mark.mkl),
+                                                pytest.param('LIBXSMM', marks=pytest.mark.libxsmm),
+                                                pytest.param('cuBLAS', marks=pytest.mark.gpu)])
 def test_gemm_no_c(implementation):
 
     Gemm.default_implementation = implementation
@@ -132,10 +132,9 @@ def run_test(implementation,
     assert diff <= 1e-5
 
 
-@pytest.mark.parametrize(
-    ('implementation', ),
-    [('pure', ), pytest.param('MKL', marks=pytest.mark.mkl),
-     pytest.param('cuBLAS', marks=pytest.mark.gpu)])
+@pytest.mark.parametrize(('implementation', ), [('pure', ), ('pure-blocked', ),
+                                                pytest.param('MKL', marks=pytest.mark.mkl),
+                                                pytest.param('cuBLAS', marks=pytest.mark.gpu)])
 def test_library_gemm(implementation):
     param_grid_trans = dict(
         transA=[True, False],
@@ -176,6 +175,216 @@ def test_library_gemm(implementation):
                       "misconfigured, skipping test for {}.".format(implementation))
 
 
+@pytest.mark.parametrize(('transA', 'transB', 'beta'), [(False, False, 0.0), (True, False, 1.0), (False, True, 0.5),
+                                                        (True, True, 0.5)])
+def test_gemm_pure_blocked_tiles(transA, transB, beta):
+    M, N, K = 25, 37, 29
+    A_shape = [K, M] if transA else [M, K]
+    B_shape = [N, K] if transB else [K, N]
+    sdfg = create_gemm_sdfg(dace.float32, A_shape, B_shape, [M, N], [M, N], transA, transB, 0.5, beta, 'pure-blocked',
+                            f'gemm_blocked_tiles_{transA}_{transB}_{str(beta).replace(".", "_")}')
+
+    # Use block sizes that do not divide the matrix sizes and split the K dimension
+    state = sdfg.start_state
+    libnode = next(n for n in state.nodes() if isinstance(n, Gemm))
+    libnode.expand(sdfg, state, mc=12, nc=32, kc=8, mr=6, nr=16)
+
+    # The rows of the register tile are unrolled
+    assert any(
+        isinstance(n, dace.nodes.MapEntry) and n.map.schedule == dace.ScheduleType.Unrolled
+        for n, _ in sdfg.all_nodes_recursive())
+
+    A = np.random.rand(*A_shape).astype(np.float32)
+    B = np.random.rand(*B_shape).astype(np.float32)
+    C = np.random.rand(M, N).astype(np.float32)
+    ref = 0.5 * ((A.T if transA else A) @ (B.T if transB else B)) + beta * C
+
+    sdfg(A=A, B=B, C=C)
+    assert np.allclose(C, ref)
+
+
+@pytest.mark.parametrize(('implementation', ), [('pure', ), ('pure-blocked', )])
+@pytest.mark.parametrize(('C_shape', ), [([25, 24], ), ([1, 24], ), ([25, 1], ), ([24], ), ([1], )])
+def test_gemm_broadcast_c(implementation, C_shape):
+    M, N, K = 25, 24, 23
+    sdfg = dace.SDFG(f'gemm_broadcast_c_{implementation.replace("-", "_")}_{"_".join(map(str, C_shape))}')
+    state = sdfg.add_state()
+    sdfg.add_array('A', [M, K], dace.float32)
+    sdfg.add_array('B', [K, N], dace.float32)
+    sdfg.add_array('C', C_shape, dace.float32)
+    sdfg.add_array('Y', [M, N], dace.float32)
+
+    libnode = Gemm('_Gemm_', alpha=2.0, beta=0.5)
+    libnode.implementation = implementation
+    state.add_node(libnode)
+    state.add_edge(state.add_read('A'), None, libnode, '_a', dace.Memlet('A'))
+    state.add_edge(state.add_read('B'), None, libnode, '_b', dace.Memlet('B'))
+    state.add_edge(state.add_read('C'), None, libnode, '_cin', dace.Memlet('C'))
+    state.add_edge(libnode, '_c', state.add_write('Y'), None, dace.Memlet('Y'))
+
+    A = np.random.rand(M, K).astype(np.float32)
+    B = np.random.rand(K, N).astype(np.float32)
+    C = np.random.rand(*C_shape).astype(np.float32)
+    Y = np.zeros((M, N), dtype=np.float32)
+    sdfg(A=A, B=B, C=C, Y=Y)
+    assert np.allclose(Y, 2.0 * (A @ B) + 0.5 * C)
+
+
+@pytest.mark.parametrize(('order_a', 'order_c', 'params'), [('C', 'C', ['__i0', '__i1']), ('C', 'F', ['__i0', '__i1']),
+                                                            ('F', 'F', ['__i1', '__i0'])])
+def test_gemm_pure_map_order(order_a, order_c, params):
+    M, N, K = 25, 24, 23
+    sdfg = dace.SDFG(f'gemm_pure_map_order_{order_a}{order_c}')
+    state = sdfg.add_state()
+    sdfg.add_array('A', [M, K], dace.float64, strides=[1, M] if order_a == 'F' else [K, 1])
+    sdfg.add_array('B', [K, N], dace.float64)
+    sdfg.add_array('C', [M, N], dace.float64, strides=[1, M] if order_c == 'F' else [N, 1])
+    libnode = Gemm('_Gemm_')
+    libnode.implementation = 'pure'
+    state.add_edge(state.add_read('A'), None, libnode, '_a', dace.Memlet('A'))
+    state.add_edge(state.add_read('B'), None, libnode, '_b', dace.Memlet('B'))
+    state.add_edge(libnode, '_c', state.add_write('C'), None, dace.Memlet('C'))
+    sdfg.expand_library_nodes()
+
+    # The innermost output index runs along the unit-stride dimensions of C and its input, if both agree
+    map_entry = next(n for n, _ in sdfg.all_nodes_recursive()
+                     if isinstance(n, dace.nodes.MapEntry) and n.map.label == 'gemm')
+    assert map_entry.map.params == params
+
+    A = np.asarray(np.random.rand(M, K), order=order_a)
+    B = np.random.rand(K, N)
+    C = np.zeros((M, N), order=order_c)
+    sdfg(A=A, B=B, C=C)
+    assert np.allclose(C, A @ B)
+
+
+@pytest.mark.parametrize(('implementation', ), [('pure', ), ('pure-blocked', )])
+@pytest.mark.parametrize(('beta', ), [(0.0, ), (1.0, )])
+def test_gemm_constant_beta(implementation, beta):
+    M, N, K = 25, 24, 23
+    sdfg = create_gemm_sdfg(dace.float64, [M, K], [K, N], [M, N], [M, N], False, False, 1.0, 0.5, implementation,
+                            f'gemm_constant_beta_{implementation.replace("-", "_")}_{int(beta)}')
+
+    # Beta is changed after C was connected
+    libnode = next(n for n in sdfg.start_state.nodes() if isinstance(n, Gemm))
+    libnode.beta = beta
+    sdfg.expand_library_nodes()
+    epilogue = next(n for n, _ in sdfg.all_nodes_recursive()
+                    if isinstance(n, dace.nodes.Tasklet) and n.label == 'gemm_out').code.as_string
+    assert '*' not in epilogue
+
+    A = np.random.rand(M, K)
+    B = np.random.rand(K, N)
+    C = np.random.rand(M, N)
+    ref = A @ B + beta * C
+    sdfg(A=A, B=B, C=C)
+    assert np.allclose(C, ref)
+
+
+@pytest.mark.parametrize(('implementation', ), [('pure', ), ('pure-blocked', )])
+@pytest.mark.parametrize(('M', 'N', 'transA', 'transB'), [(1, 24, False, False), (1, 24, True, True),
+                                                          (25, 1, False, True), (25, 1, True, False),
+                                                          (1, 1, False, False)])
+def test_gemm_unit_dims(implementation, M, N, transA, transB):
+    K = 23
+    A_shape = [K, M] if transA else [M, K]
+    B_shape = [N, K] if transB else [K, N]
+    sdfg = create_gemm_sdfg(dace.float64, A_shape, B_shape, [M, N], [M, N], transA, transB, 0.5, 0.3, implementation,
+                            f'gemm_unit_dims_{implementation.replace("-", "_")}_{M}_{N}_{transA}_{transB}')
+
+    A = np.random.rand(*A_shape)
+    B = np.random.rand(*B_shape)
+    C = np.random.rand(M, N)
+    ref = 0.5 * ((A.T if transA else A) @ (B.T if transB else B)) + 0.3 * C
+
+    sdfg(A=A, B=B, C=C)
+    assert np.allclose(C, ref)
+
+
+@pytest.mark.parametrize(('M', 'N', 'transB', 'expected'),
+                         [(1, 24, False, 'cblas_dgemv(CblasColMajor, CblasNoTrans, 24, 23, double(1.0), _b, 24, _a, 1'),
+                          (1, 24, True, 'cblas_dgemv(CblasColMajor, CblasTrans, 23, 24, double(1.0), _b, 23, _a, 1'),
+                          (25, 1, True, 'cblas_dgemv(CblasColMajor, CblasTrans, 23, 25, double(1.0), _a, 23, _b, 1')])
+def test_gemm_unit_dims_gemv(M, N, transB, expected):
+    K = 23
+    B_shape = [N, K] if transB else [K, N]
+    sdfg = create_gemm_sdfg(dace.float64, [M, K], B_shape, [M, N], [M, N], False, transB, 1.0, 0.0, 'OpenBLAS',
+                            'gemm_unit_dims_gemv')
+    state = sdfg.start_state
+    libnode = next(n for n in state.nodes() if isinstance(n, Gemm))
+    libnode.expand(sdfg, state)
+
+    tasklet = next(n for n in state.nodes() if isinstance(n, dace.nodes.Tasklet))
+    assert expected in tasklet.code.as_string
+
+
+@pytest.mark.libxsmm
+@pytest.mark.parametrize(('transA', 'transB', 'alpha', 'beta'), [(False, False, 1.0, 0.0), (True, False, 1.0, 1.0),
+                                                                 (False, True, 0.5, 0.3), (True, True, 1.0, 0.0)])
+def test_gemm_libxsmm(transA, transB, alpha, beta):
+    run_test('LIBXSMM', transA=transA, transB=transB, alpha=alpha, beta=beta)
+
+
+@pytest.mark.parametrize(('symbolic', ), [(False, ), (True, )])
+def test_gemm_libxsmm_dispatch(symbolic):
+    m, n, k = (M, N, K) if symbolic else (25, 24, 23)
+    sdfg = create_gemm_sdfg(dace.float32, [m, k], [k, n], [m, n], [m, n], False, False, 1.0, 0.0, 'LIBXSMM',
+                            'gemm_libxsmm_dispatch')
+    sdfg.expand_library_nodes()
+
+    # Kernels of fixed-size products are dispatched once, on initialization
+    tasklet = next(n for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.Tasklet))
+    if symbolic:
+        assert not tasklet.state_fields
+        assert 'libxsmm_smmdispatch(' in tasklet.code.as_string
+    else:
+        assert len(tasklet.state_fields) == 1
+        assert 'libxsmm_smmdispatch(' in tasklet.code_init.as_string
+        assert 'libxsmm_smmdispatch(' not in tasklet.code.as_string
+
+
+def test_gemm_row_major_opts():
+    from dace.libraries.blas.nodes.matmul import _get_matmul_operands, _get_codegen_gemm_opts
+
+    sdfg = create_gemm_sdfg(dace.float32, [5, 3], [4, 3], [5, 4], [5, 4], False, True, 1.0, 0.0, 'OpenBLAS',
+                            'gemm_row_major_opts')
+    state = sdfg.start_state
+    libnode = next(n for n in state.nodes() if isinstance(n, Gemm))
+    (_, adesc, _, _), (_, bdesc, _, _), (_, cdesc, _, _) = _get_matmul_operands(libnode, state, sdfg)
+
+    # Column-major interfaces compute the transposed product
+    opt = _get_codegen_gemm_opts(libnode, state, sdfg, adesc, bdesc, cdesc, None, None, 'float', 'sgemm')
+    assert opt['layout'] == 'CblasColMajor'
+    assert (opt['x'], opt['y'], opt['M'], opt['N']) == ('_b', '_a', '4', '5')
+
+    # CBLAS interfaces keep the operands in place
+    opt = _get_codegen_gemm_opts(libnode,
+                                 state,
+                                 sdfg,
+                                 adesc,
+                                 bdesc,
+                                 cdesc,
+                                 None,
+                                 None,
+                                 'float',
+                                 'sgemm',
+                                 row_major=True)
+    assert opt['layout'] == 'CblasRowMajor'
+    assert (opt['x'], opt['y'], opt['M'], opt['N']) == ('_a', '_b', '5', '4')
+    assert (opt['lda'], opt['ldb'], opt['ldc']) == ('3', '3', '4')
+
+
+@pytest.mark.parametrize('split_k', [0, -2])
+def test_gemm_split_k_invalid(split_k):
+    sdfg = create_gemm_sdfg(dace.float32, [64, 1024], [1024, 64], [64, 64], [64, 64], False, False, 1.0, 0.0, 'cuBLAS',
+                            'gemm_split_k_invalid')
+    state = sdfg.start_state
+    libnode = next(n for n in state.nodes() if isinstance(n, Gemm))
+    libnode.split_k = split_k
+    with pytest.raises(ValueError):
+        libnode.validate(sdfg, state)
+
+
 def test_gemm_symbolic():
     sdfg = dace.SDFG("gemm")
     state = sdfg.add_state()
@@ -226,5 +435,7 @@ if __name__ == "__main__":
         test_library_gemm('cuBLAS')
     # test_library_gemm('pure')
     # test_library_gemm('MKL')
+    test_gemm_row_major_opts()
+    test_gemm_split_k_invalid(0)
     test_gemm_symbolic()
     test_gemm_symbolic_1()
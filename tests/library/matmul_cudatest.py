@@ -111,7 +111,7 @@ def test_types():
 
 
 # Try all data layouts
-LAYOUTS = map(lambda t: ''.join(t), itertools.product(*([['C', 'F']] * 3)))
+LAYOUTS = list(map(lambda t: ''.join(t), itertools.product(*([['C', 'F']] * 3))))
 
 
 @pytest.mark.gpu
@@ -121,6 +121,13 @@ def test_layouts(dl):
         _test_matmul('cuBLAS float ' + dl, dace.float32, 'cuBLAS', dace.StorageType.GPU_Global, data_layout=dl)
 
 
+@pytest.mark.gpu
+@pytest.mark.parametrize('dl', LAYOUTS)
+def test_half_layouts(dl):
+    with change_default(blas, "cuBLAS"):
+        _test_matmul('cuBLAS half ' + dl, dace.float16, 'cuBLAS', dace.StorageType.GPU_Global, data_layout=dl, eps=1)
+
+
 @pytest.mark.gpu
 def test_batchmm():
     b, m, n, k = tuple(dace.symbol(k) for k in 'bmnk')
@@ -149,6 +156,157 @@ def test_batchmm():
     assert diff < 1e-6
 
 
+@pytest.mark.gpu
+def test_batchmm_half():
+    b, m, n, k = tuple(dace.symbol(k) for k in 'bmnk')
+
+    with change_default(blas, "cuBLAS"):
+
+        @dace.program
+        def bmmtest_half(A: dace.float16[b, m, k], B: dace.float16[b, k, n], C: dace.float16[b, m, n]):
+            C[:] = A @ B
+
+        sdfg = bmmtest_half.to_sdfg()
+        sdfg.apply_gpu_transformations()
+        csdfg = sdfg.compile()
+
+        b, m, n, k = 3, 32, 31, 30
+
+        x = np.random.rand(b, m, k).astype(np.float16)
+        y = np.random.rand(b, k, n).astype(np.float16)
+        z = np.zeros([b, m, n], np.float16)
+        csdfg(A=x, B=y, C=z, b=b, m=m, n=n, k=k)
+
+    # Products are accumulated in single precision
+    ref = x.astype(np.float32) @ y.astype(np.float32)
+
+    diff = np.linalg.norm(ref - z) / (b * m * n)
+    print('Difference:', diff)
+    assert diff < 1e-2
+
+
+@pytest.mark.gpu
+@pytest.mark.parametrize('a_storage', [dace.StorageType.Default, dace.StorageType.GPU_Global])
+def test_gemm_host_operands(a_storage):
+    m, n, k = 32, 31, 30
+    sdfg = dace.SDFG(f'gemm_host_operands_{a_storage.name}')
+    state = sdfg.add_state()
+    sdfg.add_array('A', [m, k], dace.float64, storage=a_storage)
+    sdfg.add_array('B', [k, n], dace.float64)
+    sdfg.add_array('C', [m, n], dace.float64)
+    gemm = blas.Gemm('gemm', alpha=0.5, beta=2.0)
+    gemm.implementation = 'cuBLAS'
+    state.add_edge(state.add_read('A'), None, gemm, '_a', Memlet('A'))
+    state.add_edge(state.add_read('B'), None, gemm, '_b', Memlet('B'))
+    state.add_edge(state.add_read('C'), None, gemm, '_cin', Memlet('C'))
+    state.add_edge(gemm, '_c', state.add_write('C'), None, Memlet('C'))
+    sdfg.expand_library_nodes()
+
+    # Only operands that are not on the GPU are copied
+    copied = {name for nsdfg in sdfg.all_sdfgs_recursive() for name in nsdfg.arrays if name.endswith('_gpu')}
+    if a_storage == dace.StorageType.GPU_Global:
+        assert copied == {'_b_gpu', '_c_gpu'}
+        return
+    assert copied == {'_a_gpu', '_b_gpu', '_c_gpu'}
+
+    x = np.random.rand(m, k)
+    y = np.random.rand(k, n)
+    z = np.random.rand(m, n)
+    ref = 0.5 * (x @ y) + 2.0 * z
+    sdfg(A=x, B=y, C=z)
+    assert np.allclose(ref, z)
+
+
+@pytest.mark.gpu
+@pytest.mark.parametrize('beta', [0.0, 2.0])
+def test_gemm_split_k(beta):
+    m, n, k = 24, 20, 4096
+    sdfg = dace.SDFG(f'gemm_split_k_{int(beta)}')
+    state = sdfg.add_state()
+    sdfg.add_array('A', [m, k], dace.float64)
+    sdfg.add_array('B', [k, n], dace.float64)
+    sdfg.add_array('C', [m, n], dace.float64)
+    gemm = blas.Gemm('gemm', alpha=0.5, beta=beta)
+    gemm.implementation = 'cuBLAS'
+    state.add_edge(state.add_read('A'), None, gemm, '_a', Memlet('A'))
+    state.add_edge(state.add_read('B'), None, gemm, '_b', Memlet('B'))
+    if beta != 0:
+        state.add_edge(state.add_read('C'), None, gemm, '_cin', Memlet('C'))
+    state.add_edge(gemm, '_c', state.add_write('C'), None, Memlet('C'))
+    sdfg.apply_gpu_transformations()
+    sdfg.expand_library_nodes()
+
+    # The small output does not occupy the GPU, so K is split into chunks whose partial products are summed up
+    workspaces = [nsdfg.arrays['_ws'] for nsdfg in sdfg.all_sdfgs_recursive() if '_ws' in nsdfg.arrays]
+    assert len(workspaces) == 1 and workspaces[0].shape[1:] == (m, n)
+
+    x = np.random.rand(m, k)
+    y = np.random.rand(k, n)
+    z = np.random.rand(m, n)
+    ref = 0.5 * (x @ y) + beta * z
+    sdfg(A=x, B=y, C=z)
+    assert np.allclose(ref, z)
+
+
+@pytest.mark.gpu
+@pytest.mark.parametrize('cin_shape', [[31], [32, 1], [32, 31]])
+def test_gemm_host_operands_cin(cin_shape):
+    m, n, k = 32, 31, 30
+    sdfg = dace.SDFG(f'gemm_host_operands_cin_{len(cin_shape)}_{cin_shape[-1]}')
+    state = sdfg.add_state()
+    sdfg.add_array('A', [m, k], dace.float64)
+    sdfg.add_array('B', [k, n], dace.float64)
+    sdfg.add_array('D', cin_shape, dace.float64)
+    sdfg.add_array('C', [m, n], dace.float64)
+    gemm = blas.Gemm('gemm', alpha=0.5, beta=2.0)
+    gemm.implementation = 'cuBLAS'
+    state.add_edge(state.add_read('A'), None, gemm, '_a', Memlet('A'))
+    state.add_edge(state.add_read('B'), None, gemm, '_b', Memlet('B'))
+    state.add_edge(state.add_read('D'), None, gemm, '_cin', Memlet('D'))
+    state.add_edge(gemm, '_c', state.add_write('C'), None, Memlet('C'))
+    sdfg.expand_library_nodes()
+    sdfg.validate()
+
+    x = np.random.rand(m, k)
+    y = np.random.rand(k, n)
+    w = np.random.rand(*cin_shape)
+    z = np.random.rand(m, n)
+    ref = 0.5 * (x @ y) + 2.0 * w
+    sdfg(A=x, B=y, D=w, C=z)
+    assert np.allclose(ref, z)
+
+
+@pytest.mark.gpu
+def test_gemm_half_offset_view():
+    # The second matrix of each array starts at an address that is only 2-byte aligned
+    m, n, k = 33, 29, 31
+    sdfg = dace.SDFG('gemm_half_offset_view')
+    state = sdfg.add_state()
+    for name, shape in [('A', [2, m, k]), ('B', [k, n]), ('C', [2, m, n])]:
+        sdfg.add_array(name, shape, dace.float16)
+        sdfg.add_array(name + '_gpu', shape, dace.float16, storage=dace.StorageType.GPU_Global, transient=True)
+    gemm = blas.Gemm('gemm')
+    gemm.implementation = 'cuBLAS'
+    a_gpu = state.add_access('A_gpu')
+    b_gpu = state.add_access('B_gpu')
+    c_gpu = state.add_access('C_gpu')
+    state.add_nedge(state.add_read('A'), a_gpu, Memlet('A'))
+    state.add_nedge(state.add_read('B'), b_gpu, Memlet('B'))
+    state.add_edge(a_gpu, None, gemm, '_a', Memlet(f'A_gpu[1, 0:{m}, 0:{k}]'))
+    state.add_edge(b_gpu, None, gemm, '_b', Memlet('B_gpu'))
+    state.add_edge(gemm, '_c', c_gpu, None, Memlet(f'C_gpu[1, 0:{m}, 0:{n}]'))
+    state.add_nedge(c_gpu, state.add_write('C'), Memlet(f'C_gpu[1, 0:{m}, 0:{n}]'))
+    sdfg.expand_library_nodes()
+    assert any('.Lt(' in n.code.as_string for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.Tasklet))
+
+    x = np.random.rand(2, m, k).astype(np.float16)
+    y = np.random.rand(k, n).astype(np.float16)
+    z = np.zeros((2, m, n), dtype=np.float16)
+    sdfg(A=x, B=y, C=z)
+    ref = x[1].astype(np.float32) @ y.astype(np.float32)
+    assert np.allclose(z[1], ref, rtol=1e-2, atol=1e-1)
+
+
 @pytest.mark.gpu
 def test_default_stream_blas_node():
     A_desc = dace.float32[10, 5]
@@ -184,10 +342,20 @@ if __name__ == '__main__':
     import os
     try:
         test_batchmm()
+        test_batchmm_half()
+        test_gemm_host_operands(dace.StorageType.Default)
+        test_gemm_host_operands(dace.StorageType.GPU_Global)
+        test_gemm_host_operands_cin([31])
+        test_gemm_host_operands_cin([32, 1])
+        test_gemm_host_operands_cin([32, 31])
+        test_gemm_half_offset_view()
+        test_gemm_split_k(0.0)
+        test_gemm_split_k(2.0)
         test_types()
         test_default_stream_blas_node()
         for dl in LAYOUTS:
             test_layouts(dl)
+            test_half_layouts(dl)
     except SystemExit as ex:
         print('\n', flush=True)
         # Skip all teardown to avoid crashes affecting exit code
@@ -0,0 +1,77 @@
+# Copyright 2019-2023 ETH Zurich and the DaCe authors. All rights reserved.
+import dace
+import numpy as np
+import pytest
+from dace.libraries.blas import Gemm, MatMul
+from dace.transformation.dataflow import FuseSequentialGemmPack
+
+M, N, K = 20, 30, 40
+
+
+@dace.program
+def shared_weight(X1: dace.float32[M, K], X2: dace.float32[M, K], X3: dace.float32[10, K], W: dace.float32[K, N],
+                  Y1: dace.float32[M, N], Y2: dace.float32[M, N], Y3: dace.float32[10, N]):
+    Y1[:] = X1 @ W
+    Y2[:] = X2 @ W
+    Y3[:] = X3 @ W
+
+
+def _make_sdfg():
+    sdfg = shared_weight.to_sdfg()
+    sdfg.expand_library_nodes(recursive=False)
+    for node, state in sdfg.all_nodes_recursive():
+        if isinstance(node, MatMul):
+            node.expand(sdfg, state)
+    sdfg.simplify()
+    return sdfg
+
+
+def test_gemm_pack_structure():
+    sdfg = _make_sdfg()
+    assert sdfg.apply_transformations(FuseSequentialGemmPack) == 1
+    sdfg.validate()
+
+    gemms = [n for n, _ in sdfg.all_nodes_recursive() if isinstance(n, Gemm)]
+    packed = [g for g in gemms if g.packed_operand is not None]
+    assert len(packed) == 2
+    assert all(g.packed_operand == '_b' and g.implementation == 'MKL' for g in packed)
+
+    # The remaining product has a different size, and thus a different packed layout
+    assert sdfg.apply_transformations(FuseSequentialGemmPack) == 0
+
+
+def test_gemm_pack_simplify():
+    sdfg = _make_sdfg()
+    assert sdfg.apply_transformations(FuseSequentialGemmPack) == 1
+    sdfg.simplify()
+    sdfg.validate()
+
+    # The packed buffer must still be allocated and freed
+    tasklets = sorted(n.label for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.Tasklet))
+    assert 'gemm_pack' in tasklets
+    assert 'gemm_pack_free' in tasklets
+
+
+@pytest.mark.mkl
+def test_gemm_pack_mkl():
+    sdfg = _make_sdfg()
+    assert sdfg.apply_transformations(FuseSequentialGemmPack) == 1
+
+    X1 = np.random.rand(M, K).astype(np.float32)
+    X2 = np.random.rand(M, K).astype(np.float32)
+    X3 = np.random.rand(10, K).astype(np.float32)
+    W = np.random.rand(K, N).astype(np.float32)
+    Y1 = np.zeros((M, N), dtype=np.float32)
+    Y2 = np.zeros((M, N), dtype=np.float32)
+    Y3 = np.zeros((10, N), dtype=np.float32)
+    sdfg(X1=X1, X2=X2, X3=X3, W=W, Y1=Y1, Y2=Y2, Y3=Y3)
+
+    assert np.allclose(Y1, X1 @ W, rtol=1e-4)
+    assert np.allclose(Y2, X2 @ W, rtol=1e-4)
+    assert np.allclose(Y3, X3 @ W, rtol=1e-4)
+
+
+if __name__ == '__main__':
+    test_gemm_pack_structure()
+    test_gemm_pack_simplify()
+    test_gemm_pack_mkl()